@@ -0,0 +1,221 @@
+"""
+Endpoint benchmarks with results kept as JSON for run-to-run comparison.
+
+Each endpoint is driven two ways:
+
+* ``test-client``: through the Django test client, one request at a time in
+  this process, so latency is the framework's own cost without sockets;
+* ``http``: over HTTP against a local threaded WSGI server (the one
+  ``LiveServerTestCase`` uses) from ``concurrency`` client threads, so
+  latency includes the socket round trip and requests contending.
+
+Both return a ``loadtest.Result``. ``save()`` writes a run to JSON and
+``compare()`` pairs its results with those of an earlier run. The
+project's ``benchmark`` command seeds a ``test_database()``, drives every
+endpoint in every mode with ``run()`` and prints the table with
+``report()``, which also saves it or compares it.
+"""
+import http.client
+import json
+import platform
+import socket
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+import django
+from django.conf import settings
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.db import connection, connections
+from django.test import Client
+from django.test.testcases import LiveServerThread
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from .loadtest import Result
+
+
+def run_client(path, headers=None, requests=500):
+    """Send ``requests`` GETs to ``path`` through the test client; return a Result"""
+    client = Client(headers=headers)
+    latencies, statuses = [], []
+    started = time.perf_counter()
+    for _ in range(requests):
+        sent = time.perf_counter()
+        statuses.append(client.get(path).status_code)
+        latencies.append(time.perf_counter() - sent)
+    return Result('test-client', 1, latencies, statuses, time.perf_counter() - started)
+
+
+class NoDelayWSGIServer(ThreadedWSGIServer):
+    """
+    The development server with Nagle's algorithm off on each connection.
+
+    It writes the headers and the body of a response separately; with Nagle
+    on, the body waits for the client's delayed ACK of the headers, adding
+    ~40ms to every keep-alive request. Production servers turn it off too.
+    """
+
+    def get_request(self):
+        sock, address = super().get_request()
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock, address
+
+
+class BenchmarkServerThread(LiveServerThread):
+    server_class = NoDelayWSGIServer
+
+
+@contextmanager
+def local_server():
+    """Serve the project on a free localhost port; yield its ``(host, port)``"""
+    # Like LiveServerTestCase: an in-memory SQLite test database only exists
+    # on this connection, so the server's threads have to share it
+    shared = {
+        conn.alias: conn for conn in connections.all()
+        if conn.vendor == 'sqlite' and conn.is_in_memory_db()
+    }
+    for conn in shared.values():
+        conn.inc_thread_sharing()
+    server = BenchmarkServerThread('localhost', lambda handler: handler, connections_override=shared)
+    server.daemon = True
+    server.start()
+    server.is_ready.wait()
+    try:
+        if server.error:
+            raise server.error
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, server.host]):
+            yield server.host, server.port
+    finally:
+        server.terminate()
+        server.join()
+        for conn in shared.values():
+            conn.dec_thread_sharing()
+
+
+def run_server(address, path, headers=None, concurrency=10, requests=500):
+    """Send ``requests`` GETs to ``path`` at ``address`` from ``concurrency`` threads; return a Result"""
+    latencies, statuses = [], []
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+
+    def client():
+        conn = http.client.HTTPConnection(*address)
+        try:
+            while True:
+                with lock:
+                    if next(remaining, None) is None:
+                        return
+                sent = time.perf_counter()
+                conn.request('GET', path, headers=headers or {})
+                response = conn.getresponse()
+                response.read()
+                latency = time.perf_counter() - sent
+                with lock:
+                    latencies.append(latency)
+                    statuses.append(response.status)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return Result('http', concurrency, latencies, statuses, time.perf_counter() - started)
+
+
+def save(path, results, **meta):
+    """Write ``results`` (``(endpoint, Result)`` pairs) and ``meta`` to ``path`` as JSON"""
+    data = {
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connections['default'].vendor,
+        **meta,
+        'results': [{'endpoint': endpoint, **result.as_dict()} for endpoint, result in results],
+    }
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(previous, results):
+    """The entry of ``previous`` (a loaded run) matching each of ``results``, or None"""
+    earlier = {
+        (entry['endpoint'], entry['server'], entry['concurrency']): entry
+        for entry in previous['results']
+    }
+    return [earlier.get((endpoint, result.server, result.concurrency)) for endpoint, result in results]
+
+
+def add_arguments(parser):
+    """The options of a benchmark command besides its seed counts"""
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and run')
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=[1, 10], help='Client threads against the local server',
+    )
+    parser.add_argument('--mode', nargs='+', choices=['test-client', 'http'], default=['test-client', 'http'])
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Show the change from the results in this JSON file')
+
+
+@contextmanager
+def test_database():
+    """Run the block against a throwaway test database"""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def session_headers(user):
+    """Headers authenticating requests as ``user`` with a session cookie"""
+    client = Client()
+    client.force_login(user)
+    return {'Cookie': f'sessionid={client.cookies["sessionid"].value}', 'Accept': 'application/json'}
+
+
+def run(endpoints, headers, options):
+    """Drive each ``(label, path)`` of ``endpoints`` in the ``--mode``s; return ``(label, Result)`` pairs"""
+    results = []
+    with local_server() if 'http' in options['mode'] else nullcontext() as address:
+        for label, path in endpoints:
+            if 'test-client' in options['mode']:
+                results.append((label, run_client(path, headers, options['requests'])))
+            if 'http' in options['mode']:
+                for concurrency in options['concurrency']:
+                    results.append((label, run_server(address, path, headers, concurrency, options['requests'])))
+    return results
+
+
+def report(command, results, previous, options, **meta):
+    """Print ``results`` (against ``previous``, a loaded run, if given) and save them to ``--output``"""
+    header = f'{"endpoint":<28}{"mode":<13}{"conc":>6}{"req/s":>9}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"errors":>8}'
+    earlier = compare(previous, results) if previous else [None] * len(results)
+    if previous:
+        header += f'{"req/s %":>9}{"p95 %":>9}'
+    command.stdout.write(header)
+    for (label, result), entry in zip(results, earlier):
+        row = (
+            f'{label:<28}{result.server:<13}{result.concurrency:>6}{result.throughput:>9.1f}'
+            f'{result.percentile(50) * 1000:>9.1f}{result.percentile(95) * 1000:>9.1f}'
+            f'{result.percentile(99) * 1000:>9.1f}{result.errors:>8}'
+        )
+        if entry:
+            row += (
+                f'{(result.throughput / entry["throughput"] - 1) * 100:>+9.1f}'
+                f'{(result.percentile(95) * 1000 / entry["p95_ms"] - 1) * 100:>+9.1f}'
+            )
+        command.stdout.write(command.style.ERROR(row) if result.errors else row)
+    if options['output']:
+        save(options['output'], results, **meta)
+        command.stdout.write(f'Results written to {options["output"]}')
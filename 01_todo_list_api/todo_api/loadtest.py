@@ -0,0 +1,179 @@
+"""
+In-process load generator comparing WSGI and ASGI serving.
+
+No sockets are involved. Each run simulates ``concurrency`` clients that
+issue requests back to back until ``requests`` have been sent:
+
+* ``wsgi``: requests go through Django's ``WSGIHandler`` on a pool of
+  ``wsgi_threads`` worker threads, like a threaded WSGI server (latency
+  includes time queued for a free thread);
+* ``asgi``: requests go through ``AsyncViewsASGIHandler`` (the ASGI
+  application, serving async views where a route has one) on one event
+  loop, like a single-process ASGI server.
+
+Latency is measured from the moment a client sends a request until its
+response body is complete.
+"""
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIHandler
+
+from .async_views import AsyncViewsASGIHandler
+
+HOST = 'testserver'
+
+
+def wsgi_request(handler, path, headers):
+    """Serve one GET through ``handler``; return the status code"""
+    url = urlsplit(path)
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': url.path,
+        'QUERY_STRING': url.query,
+        'SERVER_NAME': HOST,
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': HOST,
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    environ.update({f'HTTP_{name.upper().replace("-", "_")}': value for name, value in headers.items()})
+    status = []
+    body = handler(environ, lambda line, response_headers, exc_info=None: status.append(line))
+    try:
+        for _ in body:
+            pass
+    finally:
+        body.close()
+    return int(status[0].split()[0])
+
+
+async def asgi_request(handler, path, headers):
+    """Serve one GET through ``handler``; return the status code"""
+    url = urlsplit(path)
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': url.path,
+        'raw_path': url.path.encode(),
+        'query_string': url.query.encode(),
+        'root_path': '',
+        'headers': [(b'host', HOST.encode())] + [
+            (name.lower().encode(), value.encode()) for name, value in headers.items()
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': (HOST, 80),
+    }
+    requested = False
+    status = None
+    done = asyncio.Event()
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # The client never disconnects; Django cancels this wait when done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif not message.get('more_body', False):
+            done.set()
+
+    await handler(scope, receive, send)
+    await done.wait()
+    return status
+
+
+class Result:
+    """Latencies (seconds) and status codes of one run"""
+
+    def __init__(self, server, concurrency, latencies, statuses, elapsed):
+        self.server = server
+        self.concurrency = concurrency
+        self.latencies = latencies
+        self.statuses = statuses
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self):
+        return len(self.latencies) / self.elapsed
+
+    @property
+    def errors(self):
+        return sum(1 for status in self.statuses if status >= 400)
+
+    def percentile(self, p):
+        if len(self.latencies) < 2:
+            return self.latencies[0] if self.latencies else 0.0
+        return statistics.quantiles(self.latencies, n=100, method='inclusive')[p - 1]
+
+    def as_dict(self):
+        return {
+            'server': self.server,
+            'concurrency': self.concurrency,
+            'requests': len(self.latencies),
+            'errors': self.errors,
+            'throughput': self.throughput,
+            **{f'p{p}_ms': self.percentile(p) * 1000 for p in (50, 95, 99)},
+        }
+
+
+async def _drive(send_one, path, headers, concurrency, requests):
+    latencies, statuses = [], []
+    remaining = requests
+
+    async def client():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            statuses.append(await send_one(path, headers))
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def run(server, path, headers=None, concurrency=50, requests=1000, wsgi_threads=16):
+    """Load ``path`` through ``server`` ('wsgi' or 'asgi') and return a Result"""
+    headers = headers or {}
+    if server == 'wsgi':
+        handler = WSGIHandler()
+        pool = ThreadPoolExecutor(max_workers=wsgi_threads, thread_name_prefix='wsgi')
+
+        async def send_one(path, headers):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(pool, wsgi_request, handler, path, headers)
+
+        try:
+            latencies, statuses, elapsed = asyncio.run(_drive(send_one, path, headers, concurrency, requests))
+        finally:
+            pool.shutdown()
+    else:
+        handler = AsyncViewsASGIHandler()
+
+        async def send_one(path, headers):
+            return await asgi_request(handler, path, headers)
+
+        latencies, statuses, elapsed = asyncio.run(_drive(send_one, path, headers, concurrency, requests))
+    return Result(server, concurrency, latencies, statuses, elapsed)
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Move this to top
+    'todo_api.instrumentation.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -101,6 +104,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: PASSWORD_HASHER picks the algorithm new passwords use,
+# argon2 where argon2-cffi is installed and scrypt otherwise. The rest stay
+# listed so existing hashes still verify; they are re-encoded with the
+# preferred hasher on the next login
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'scrypt')
+_PASSWORD_HASHERS = {
+    'argon2': 'todo_api.hashers.Argon2PasswordHasher',
+    'scrypt': 'todo_api.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -137,5 +154,21 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Delta sync: tombstones older than this are pruned; clients syncing from
+# before it get a full reset instead of a delta
+TODO_TOMBSTONE_RETENTION_DAYS = 30
+# Each delta also re-sends changes stamped this many seconds before the
+# client's watermark: timestamps are taken before their transaction commits,
+# so a change may become visible after a later-stamped one was synced
+TODO_SYNC_OVERLAP_SECONDS = 5
+
+# Seconds a cached todo list page lives; changes invalidate it immediately
+TODO_LIST_CACHE_TIMEOUT = 60
+
+# Raise instead of only logging when a view action runs more queries than its
+# query_budgets entry allows (QUERY_BUDGET_RAISE=1); tests turn it on through
+# todo_api.testing.QueryBudgetTestCase, whatever runs them
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE') == '1'
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
\ No newline at end of file
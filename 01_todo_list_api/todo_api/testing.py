@@ -0,0 +1,7 @@
+"""Test case base shared by the apps' test modules"""
+from django.test import TestCase, override_settings
+
+
+@override_settings(QUERY_BUDGET_RAISE=True)
+class QueryBudgetTestCase(TestCase):
+    """TestCase whose requests fail when a view action goes over its query budget"""
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from todo_api.instrumentation import MetricsView
 from todos.views import TodoViewSet
 from users.views import UserRegistrationView, UserLoginView, UserLogoutView, UserProfileView
 
@@ -14,4 +15,5 @@ urlpatterns = [
     path('api/login/', UserLoginView.as_view(), name='user-login'),
     path('api/users/logout/', UserLogoutView.as_view(), name='user-logout'),
     path('api/users/profile/', UserProfileView.as_view(), name='user-profile'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
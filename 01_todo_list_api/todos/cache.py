@@ -0,0 +1,98 @@
+"""
+Per-user cache of rendered todo list pages.
+
+Page entries are keyed by (user, list version, request URL, media type).
+The list version is the per-user counter that also validates the list's
+ETags (see ``todo_api.conditional``), so bumping it on any change to that
+user's todos makes all of their cached pages unreachable at once without
+scanning keys. Unreachable entries simply expire after
+``TODO_LIST_CACHE_TIMEOUT`` seconds.
+
+Hit/miss counters live in the cache too, so they add up across workers.
+The ``a``-prefixed variants are for async views.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from todo_api.conditional import aget_list_version, bump_list_version, get_list_version
+
+HITS_KEY = 'todos:list-cache:hits'
+MISSES_KEY = 'todos:list-cache:misses'
+
+
+def list_version(user_id):
+    """Name of the list version of ``user_id``'s todos"""
+    return f'todos:{user_id}'
+
+
+def invalidate_todo_lists(user_id):
+    """Make every cached list page of ``user_id`` stale (one cache write)"""
+    bump_list_version(list_version(user_id))
+
+
+def _page_key(request, version):
+    url = request.build_absolute_uri()
+    digest = hashlib.sha1(f'{url} {request.accepted_media_type}'.encode()).hexdigest()
+    return f'todos:list-cache:{request.user.pk}:{version}:{digest}'
+
+
+def page_key(request):
+    """Cache key for the list page ``request`` asks for"""
+    return _page_key(request, get_list_version(list_version(request.user.pk)))
+
+
+async def apage_key(request):
+    return _page_key(request, await aget_list_version(list_version(request.user.pk)))
+
+
+def get_page(key):
+    data = cache.get(key)
+    _count(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+async def aget_page(key):
+    data = await cache.aget(key)
+    await _acount(MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_page(key, data):
+    cache.set(key, data, settings.TODO_LIST_CACHE_TIMEOUT)
+
+
+async def aset_page(key, data):
+    await cache.aset(key, data, settings.TODO_LIST_CACHE_TIMEOUT)
+
+
+def _count(key):
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, None)
+
+
+async def _acount(key):
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, None)
+
+
+def get_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else None,
+    }
+
+
+def reset_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
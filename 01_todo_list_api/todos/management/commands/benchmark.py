@@ -0,0 +1,50 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from todo_api import benchmark
+from todos.models import Todo
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed users and todos into a throwaway test database, then report '
+        'throughput and p50/p95/p99 latency of the todo endpoints through the '
+        'test client and over HTTP against a local server'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users to seed')
+        parser.add_argument('--todos', type=int, default=10000, help='Number of todos to seed')
+        benchmark.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        previous = benchmark.load(options['compare']) if options['compare'] else None
+        scale = {'users': options['users'], 'todos': options['todos']}
+        with benchmark.test_database():
+            started = time.perf_counter()
+            user = self.seed(**scale)
+            seed_seconds = time.perf_counter() - started
+            self.stdout.write(f'Seeded {scale["users"]} users, {scale["todos"]} todos in {seed_seconds:.1f}s')
+            results = benchmark.run(self.get_endpoints(user), benchmark.session_headers(user), options)
+        benchmark.report(self, results, previous, options, scale=scale, seed_seconds=seed_seconds)
+
+    def seed(self, users, todos):
+        # manage.py seed's bulk loader
+        call_command('seed', users=max(users, 1), todos=todos, stdout=StringIO())
+        return User.objects.order_by('pk').first()
+
+    def get_endpoints(self, user):
+        todo = Todo.objects.filter(user=user).first()
+        endpoints = [
+            ('todo list', reverse('todo-list')),
+            ('todo list compact', f'{reverse("todo-list")}?view=compact'),
+            ('todo list open', f'{reverse("todo-list")}?completed=false'),
+            ('todo sync snapshot', reverse('todo-sync')),
+        ]
+        if todo is not None:
+            endpoints.append(('todo detail', reverse('todo-detail', args=[todo.pk])))
+        return endpoints
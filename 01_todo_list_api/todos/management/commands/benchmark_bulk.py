@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from todos.models import Todo
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare N single-todo requests against one bulk request for create, '
+        'update, toggle and delete, inside a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=500)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='bench', email='bench@example.com', password='bench')
+            self.client = APIClient()
+            self.client.force_authenticate(user)
+            self.run(options['items'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def timed(self, requests):
+        """Seconds to send every ``(method, url, payload)``; each must succeed"""
+        started = time.perf_counter()
+        for method, url, payload in requests:
+            response = getattr(self.client, method)(url, payload, format='json')
+            assert response.status_code < 300, response.data
+        return time.perf_counter() - started
+
+    def run(self, items):
+        bulk_url = reverse('todo-bulk')
+        toggle_url = reverse('todo-bulk-toggle')
+        results = []
+
+        single = self.timed([('post', reverse('todo-list'), {'title': f'Single {i}'}) for i in range(items)])
+        bulk = self.timed([('post', bulk_url, [{'title': f'Bulk {i}'} for i in range(items)])])
+        results.append(('create', single, bulk))
+
+        singles = list(Todo.objects.filter(title__startswith='Single').values_list('pk', flat=True))
+        bulks = list(Todo.objects.filter(title__startswith='Bulk').values_list('pk', flat=True))
+
+        single = self.timed([('patch', reverse('todo-detail', args=[pk]), {'title': f'Renamed {pk}'}) for pk in singles])
+        bulk = self.timed([('patch', bulk_url, [{'id': pk, 'title': f'Renamed {pk}'} for pk in bulks])])
+        results.append(('update', single, bulk))
+
+        single = self.timed([('patch', reverse('todo-detail', args=[pk]), {'completed': True}) for pk in singles])
+        bulk = self.timed([('patch', toggle_url, {'ids': bulks, 'completed': True})])
+        results.append(('toggle', single, bulk))
+
+        single = self.timed([('delete', reverse('todo-detail', args=[pk]), None) for pk in singles])
+        bulk = self.timed([('delete', bulk_url, {'ids': bulks})])
+        results.append(('delete', single, bulk))
+
+        self.stdout.write(f'{items} todos per operation')
+        self.stdout.write(f'{"operation":<12}{"single ms":>12}{"bulk ms":>12}{"speedup":>10}')
+        for operation, single, bulk in results:
+            self.stdout.write(
+                f'{operation:<12}{single * 1000:>12.1f}{bulk * 1000:>12.1f}{single / max(bulk, 1e-6):>9.1f}x'
+            )
@@ -0,0 +1,62 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from todos.models import Todo
+from todos.serializers import TodoCompactSerializer, TodoSerializer
+from users.models import User
+from users.serializers import UserSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare payload size, queries and serialization time of todo list '
+        'pages: nested owner without a join (the old default), nested owner '
+        'with select_related, and the compact representation'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[10, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='bench', email='bench@example.com', password='bench')
+            Todo.objects.bulk_create([
+                Todo(title=f'Todo {i}', description='Something to get done ' * 3, user=user)
+                for i in range(max(options['rows']))
+            ])
+            self.run(user, options['rows'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def render(self, variant, user, rows):
+        queryset = Todo.objects.filter(user=user).order_by('-created_at', '-pk')
+        if variant == 'nested':
+            return JSONRenderer().render({'results': TodoSerializer(queryset[:rows], many=True).data})
+        if variant == 'nested+join':
+            queryset = queryset.select_related('user')
+            return JSONRenderer().render({'results': TodoSerializer(queryset[:rows], many=True).data})
+        return JSONRenderer().render({
+            'owner': UserSerializer(user).data,
+            'results': TodoCompactSerializer(queryset[:rows], many=True).data,
+        })
+
+    def run(self, user, row_counts, repeat):
+        self.stdout.write(f'{"rows":>6}  {"variant":<13}{"bytes":>10}{"queries":>9}{"median ms":>11}')
+        for rows in row_counts:
+            for variant in ('nested', 'nested+join', 'compact'):
+                with CaptureQueriesContext(connection) as queries:
+                    payload = self.render(variant, user, rows)
+                samples = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    self.render(variant, user, rows)
+                    samples.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f'{rows:>6}  {variant:<13}{len(payload):>10}{len(queries):>9}{statistics.median(samples):>11.2f}'
+                )
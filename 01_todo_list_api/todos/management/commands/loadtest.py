@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from todo_api import benchmark, loadtest
+from todos.models import Todo
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare WSGI and ASGI serving of the todo list (an async view under '
+        'ASGI) and a todo detail (sync either way): throughput and p50/p99 latency per '
+        'concurrency level, in-process against a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per run')
+        parser.add_argument('--wsgi-threads', type=int, default=16)
+        parser.add_argument('--todos', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark.test_database():
+            user = User.objects.create_user(username='bench', email='bench@example.com', password='bench')
+            Todo.objects.bulk_create([Todo(title=f'Todo {i}', user=user) for i in range(options['todos'])])
+            endpoints = [
+                ('todo list', reverse('todo-list')),
+                ('todo detail', reverse('todo-detail', args=[Todo.objects.first().pk])),
+            ]
+            self.run(endpoints, benchmark.session_headers(user), options)
+
+    def run(self, endpoints, headers, options):
+        self.stdout.write(
+            f'{"endpoint":<20}{"server":<7}{"conc":>6}{"req/s":>9}{"p50 ms":>9}{"p99 ms":>9}{"errors":>8}'
+        )
+        for label, path in endpoints:
+            for concurrency in options['concurrency']:
+                for server in ('wsgi', 'asgi'):
+                    result = loadtest.run(
+                        server, path, headers, concurrency=concurrency,
+                        requests=options['requests'], wsgi_threads=options['wsgi_threads'],
+                    )
+                    self.stdout.write(
+                        f'{label:<20}{server:<7}{concurrency:>6}{result.throughput:>9.1f}'
+                        f'{result.percentile(50) * 1000:>9.1f}{result.percentile(99) * 1000:>9.1f}{result.errors:>8}'
+                    )
@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from todo_api import seeding
+from todo_api.seeding import bulk_load, next_id
+from todos.models import Todo
+from users.models import User
+
+WORDS = (
+    'buy', 'call', 'email', 'fix', 'plan', 'review', 'write', 'book', 'clean', 'pay',
+    'milk', 'report', 'dentist', 'invoice', 'garden', 'slides', 'tickets', 'car', 'taxes', 'party',
+)
+
+
+def user_rows(rng, start, stop, first_id, password, now):
+    rows = []
+    for i in range(start, stop):
+        pk = first_id + i
+        joined = now - timedelta(hours=rng.randrange(24 * 365))
+        rows.append((pk, f'user{pk}', f'user{pk}@example.com', password, joined))
+    return rows
+
+
+def todo_rows(rng, start, stop, first_user, users, now):
+    rows = []
+    for _ in range(start, stop):
+        created = now - timedelta(hours=rng.randrange(24 * 365))
+        due = (created + timedelta(days=rng.randrange(60))).date() if rng.random() < 0.4 else None
+        rows.append((
+            ' '.join(rng.choices(WORDS, k=3)).capitalize(),
+            first_user + rng.randrange(users),
+            rng.random() < 0.3,
+            due,
+            created,
+            created,
+        ))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with synthetic users and todos, all sharing one '
+        'password, in batched multi-row inserts; deterministic per --seed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to create')
+        parser.add_argument('--todos', type=int, default=100000, help='Number of todos to create')
+        seeding.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        users = options['users']
+        with bulk_load(self, options) as insert:
+            # Hashed once: every seeded user signs in with --password
+            password = make_password(options['password'])
+            now = timezone.now().replace(minute=0, second=0, microsecond=0)
+            first_user = next_id(User)
+            insert(User, ['id', 'username', 'email', 'password', 'date_joined'], user_rows, users, first_user,
+                   password, now)
+            if users:
+                insert(Todo, ['title', 'user', 'completed', 'due_date', 'created_at', 'updated_at'], todo_rows,
+                       options['todos'], first_user, users, now)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0004_todo_sync'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('completed', False)), fields=['user', '-created_at', '-id'], name='todos_user_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('completed', True)), fields=['user', '-created_at', '-id'], name='todos_user_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(condition=models.Q(('due_date__isnull', False)), fields=['user', 'due_date', '-created_at', '-id'], name='todos_user_due_idx'),
+        ),
+    ]
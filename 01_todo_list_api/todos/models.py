@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings  # NOT django.contrib.conf
+from django.utils import timezone
 
 class Todo(models.Model):
     """Todo item model"""
@@ -14,6 +15,43 @@ class Todo(models.Model):
     class Meta:
         db_table = 'todos'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of a user's list: WHERE user_id = %s AND (created_at, id) < (...)
+            models.Index(fields=['user', '-created_at', '-id'], name='todos_user_created_idx'),
+            # Delta sync: WHERE user_id = %s AND updated_at > %s
+            models.Index(fields=['user', 'updated_at'], name='todos_user_updated_idx'),
+            # ?completed= on the list. Booleans compile to bare WHERE [NOT] completed,
+            # which an index can only match as a partial-index condition
+            models.Index(
+                fields=['user', '-created_at', '-id'], name='todos_user_open_idx',
+                condition=models.Q(completed=False),
+            ),
+            models.Index(
+                fields=['user', '-created_at', '-id'], name='todos_user_done_idx',
+                condition=models.Q(completed=True),
+            ),
+            # ?due_date= on the list, newest first; undated todos are left out
+            models.Index(
+                fields=['user', 'due_date', '-created_at', '-id'], name='todos_user_due_idx',
+                condition=models.Q(due_date__isnull=False),
+            ),
+        ]
     
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class TodoTombstone(models.Model):
+    """Deletion log so sync clients can drop todos deleted since their last watermark"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    todo_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'todo_tombstones'
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='tombstones_user_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f'Todo {self.todo_id} deleted at {self.deleted_at}'
@@ -1,7 +1,73 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
+from .cache import invalidate_todo_lists
 from .models import Todo
 from users.serializers import UserSerializer
 
+# Upper bound on items in one bulk request
+BULK_MAX_ITEMS = 500
+
+
+class TodoListSerializer(serializers.ListSerializer):
+    """
+    Bulk create/update for ``TodoSerializer(many=True)``.
+
+    Creates are one ``bulk_create`` and updates one ``bulk_update``, each in
+    a single transaction. For updates ``instance`` is the list of todos the
+    caller is allowed to touch (fetched in one query); every item must carry
+    the ``id`` of one of them.
+    """
+
+    def get_item_instance(self, data):
+        """The todo an update item's ``id`` names; raises if it is missing or not the caller's"""
+        pk = data.get('id') if isinstance(data, dict) else None
+        todo = self.instances_by_pk.get(pk) if isinstance(pk, int) else None
+        if todo is None:
+            message = 'This field is required.' if pk is None else 'Todo not found.'
+            raise serializers.ValidationError({'id': [message]})
+        return todo
+
+    @property
+    def instances_by_pk(self):
+        if not hasattr(self, '_instances_by_pk'):
+            self._instances_by_pk = {todo.pk: todo for todo in self.instance}
+        return self._instances_by_pk
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            ids = [item['id'] for item in attrs]
+            if len(ids) != len(set(ids)):
+                raise serializers.ValidationError('Each todo may only appear once per request.')
+        return attrs
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        todos = [Todo(user=user, **attrs) for attrs in validated_data]
+        with transaction.atomic():
+            todos = Todo.objects.bulk_create(todos)
+        # bulk_create() sends no signals
+        invalidate_todo_lists(user.pk)
+        return todos
+
+    def update(self, instance, validated_data):
+        # bulk_update() skips auto_now, so stamp updated_at ourselves
+        now = timezone.now()
+        fields = {'updated_at'}
+        todos = []
+        for attrs in validated_data:
+            todo = self.instances_by_pk[attrs.pop('id')]
+            for name, value in attrs.items():
+                setattr(todo, name, value)
+            fields.update(attrs)
+            todo.updated_at = now
+            todos.append(todo)
+        with transaction.atomic():
+            Todo.objects.bulk_update(todos, sorted(fields))
+        invalidate_todo_lists(self.context['request'].user.pk)
+        return todos
+
 
 class TodoSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
@@ -10,10 +76,41 @@ class TodoSerializer(serializers.ModelSerializer):
         model = Todo
         fields = ['id','title','description','completed','due_date','created_at','updated_at','user']
         read_only_fields = ['created_at','updated_at','user']
+        list_serializer_class = TodoListSerializer
+
+    def run_validation(self, data=empty):
+        # Bulk update items each validate against the todo their id names
+        if isinstance(self.parent, TodoListSerializer) and self.parent.instance is not None:
+            self.instance = self.parent.get_item_instance(data)
+            validated = super().run_validation(data)
+            validated['id'] = self.instance.pk
+            return validated
+        return super().run_validation(data)
 
     def create(self, validated_data):
         validated_data['user'] = self.context['request'].user
         return super().create(validated_data)
 
-class TodoToggleSerializer(serializers.ModelSerializer):
+class TodoCompactSerializer(TodoSerializer):
+    """List rows without the owner; the list envelope carries it once"""
+
+    class Meta(TodoSerializer.Meta):
+        fields = ['id','title','description','completed','due_date','created_at','updated_at','user_id']
+        read_only_fields = ['created_at','updated_at','user_id']
+
+class TodoToggleSerializer(serializers.Serializer):
     completed = serializers.BooleanField()
+
+
+class TodoBulkIdsSerializer(serializers.Serializer):
+    """A list of todo ids for bulk delete"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
+class TodoBulkToggleSerializer(TodoBulkIdsSerializer, TodoToggleSerializer):
+    """A list of todo ids and the completion status to give them"""
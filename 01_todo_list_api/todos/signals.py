@@ -0,0 +1,55 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_todo_lists
+from .models import Todo, TodoTombstone
+
+# (tombstones, owner ids) of the todos deleted inside batched_deletions()
+_batch = ContextVar('todo_deletions', default=None)
+
+
+@contextmanager
+def batched_deletions():
+    """
+    Defer the bookkeeping of todos deleted inside the block: their tombstones
+    are written with one INSERT and each owner's cached lists invalidated
+    once, when the block exits without an error.
+    """
+    tombstones, user_ids = [], set()
+    token = _batch.set((tombstones, user_ids))
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    TodoTombstone.objects.bulk_create(tombstones)
+    for user_id in user_ids:
+        invalidate_todo_lists(user_id)
+
+
+@receiver(post_delete, sender=Todo)
+def record_tombstone(sender, instance, origin=None, **kwargs):
+    """Log deleted todos for delta sync"""
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not Todo:
+        # Cascade from deleting the owner: their tombstones are going too
+        return
+    tombstone = TodoTombstone(user_id=instance.user_id, todo_id=instance.pk)
+    batch = _batch.get()
+    if batch is None:
+        tombstone.save()
+    else:
+        batch[0].append(tombstone)
+
+
+@receiver(post_save, sender=Todo)
+@receiver(post_delete, sender=Todo)
+def invalidate_cached_lists(sender, instance, signal, **kwargs):
+    batch = _batch.get()
+    if signal is post_delete and batch is not None:
+        batch[1].add(instance.user_id)
+    else:
+        invalidate_todo_lists(instance.user_id)
@@ -1,3 +1,533 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.client import AsyncClientHandler
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.test import APIClient
+from todo_api.async_views import AsyncViewsHandlerMixin
+from todo_api.explain import endpoint_queryset, full_scans
+from todo_api.instrumentation import QueryBudgetExceeded, registry
+from todo_api.testing import QueryBudgetTestCase
+from users.models import User
+from .models import Todo, TodoTombstone
+from .views import TodoViewSet
+
+
+class TodoKeysetPaginationTests(QueryBudgetTestCase):
+    """Todo lists page by (created_at, id) cursors instead of OFFSET"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        Todo.objects.bulk_create(
+            [Todo(title=f'Todo {i}', user=cls.user) for i in range(25)] +
+            [Todo(title='Not mine', user=other)]
+        )
+        # Identical timestamps force the id tiebreak
+        Todo.objects.filter(user=cls.user, pk__lte=Todo.objects.order_by('pk')[9].pk).update(
+            created_at=timezone.now()
+        )
+
+    def setUp(self):
+        # Fixtures are bulk-created, which bypasses list cache invalidation
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, params=None):
+        pages = []
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url, params = response.data['next'], None
+        return pages
+
+    def test_pages_cover_every_todo_once_in_order(self):
+        pages = self.walk(reverse('todo-list'))
+        self.assertEqual([len(page['results']) for page in pages], [10, 10, 5])
+        self.assertNotIn('count', pages[0])
+        ids = [todo['id'] for page in pages for todo in page['results']]
+        expected = list(
+            Todo.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get(reverse('todo-list')).data
+        second = self.client.get(first['next']).data
+        back = self.client.get(second['previous']).data
+        self.assertEqual(back['results'], first['results'])
+        self.assertIsNone(first['previous'])
+
+    def test_deep_page_costs_the_same_as_first(self):
+        second = self.client.get(reverse('todo-list')).data['next']
+        cache.clear()
+        with CaptureQueriesContext(connection) as first_queries:
+            self.client.get(reverse('todo-list'))
+        with CaptureQueriesContext(connection) as deep_queries:
+            self.client.get(second)
+        self.assertEqual(len(deep_queries), len(first_queries))
+        # No COUNT at all: neither a paginator COUNT(*) nor an ETag aggregate
+        self.assertNotIn('COUNT(', ' '.join(query['sql'] for query in deep_queries.captured_queries))
+        page_query = next(query['sql'] for query in deep_queries.captured_queries if 'LIMIT 11' in query['sql'])
+        self.assertNotIn('OFFSET', page_query)
+
+    def test_ordering_param_and_invalid_cursor(self):
+        pages = self.walk(reverse('todo-list'), {'ordering': 'title'})
+        titles = [todo['title'] for page in pages for todo in page['results']]
+        self.assertEqual(titles, sorted(titles))
+        self.assertEqual(len(titles), 25)
+
+        response = self.client.get(reverse('todo-list'), {'cursor': 'garbage'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_nullable_ordering_pages_undated_todos_last(self):
+        today = timezone.now().date()
+        for i, todo in enumerate(Todo.objects.filter(user=self.user).order_by('pk')[:12]):
+            todo.due_date = today + timedelta(days=i % 4)
+            todo.save(update_fields=['due_date'])
+        cache.clear()
+        for ordering in ('due_date', '-due_date'):
+            pages = self.walk(reverse('todo-list'), {'ordering': ordering})
+            rows = [todo for page in pages for todo in page['results']]
+            self.assertEqual(len({todo['id'] for todo in rows}), 25)
+            dated = [todo['due_date'] for todo in rows[:12]]
+            self.assertEqual(dated, sorted(dated, reverse=ordering.startswith('-')))
+            self.assertEqual([todo['due_date'] for todo in rows[12:]], [None] * 13)
+
+            # Walking back from the last page retraces the same rows
+            back, url = [], pages[-1]['previous']
+            while url:
+                page = self.client.get(url).data
+                back = page['results'] + back
+                url = page['previous']
+            self.assertEqual(back + pages[-1]['results'], rows)
+
+
+class TodoBulkTests(QueryBudgetTestCase):
+    """Bulk endpoints handle a whole list in one request and a fixed number of queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        cls.other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        cls.todos = Todo.objects.bulk_create([Todo(title=f'Todo {i}', user=cls.user) for i in range(5)])
+        cls.foreign = Todo.objects.create(title='Not mine', user=cls.other)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('todo-bulk')
+
+    def test_bulk_create(self):
+        payload = [{'title': f'New {i}', 'completed': i % 2 == 0} for i in range(50)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data), 50)
+        self.assertTrue(all(todo['id'] and todo['created_at'] for todo in response.data))
+        self.assertEqual(Todo.objects.filter(user=self.user, title__startswith='New').count(), 50)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        response = self.client.post(self.url, [{'title': 'Fine'}, {'completed': True}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('title', response.data[1])
+        self.assertFalse(Todo.objects.filter(title='Fine').exists())
+
+    def test_bulk_update(self):
+        payload = [{'id': todo.pk, 'title': f'Renamed {todo.pk}'} for todo in self.todos]
+        payload[0]['completed'] = True
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, 200)
+        updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        for todo in self.todos:
+            todo.refresh_from_db()
+            self.assertEqual(todo.title, f'Renamed {todo.pk}')
+        self.assertTrue(self.todos[0].completed)
+        self.assertFalse(self.todos[1].completed)
+
+    def test_bulk_update_rejects_foreign_missing_and_duplicate_ids(self):
+        mine = self.todos[0].pk
+        response = self.client.patch(
+            self.url, [{'id': mine, 'title': 'x'}, {'id': self.foreign.pk, 'title': 'x'}, {'title': 'x'}],
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        # A list of per-item errors on DRF 3.14, only the failing indexes after
+        errors = dict(enumerate(response.data)) if isinstance(response.data, list) else response.data
+        self.assertEqual({index for index, error in errors.items() if error}, {1, 2})
+        self.assertEqual(Todo.objects.get(pk=self.foreign.pk).title, 'Not mine')
+        self.assertEqual(Todo.objects.get(pk=mine).title, 'Todo 0')
+
+        response = self.client.patch(self.url, [{'id': mine, 'title': 'a'}, {'id': mine, 'title': 'b'}], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete(self):
+        ids = [todo.pk for todo in self.todos[:3]]
+        response = self.client.delete(self.url, {'ids': ids + [self.foreign.pk]}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['ids'], [self.foreign.pk])
+        self.assertEqual(Todo.objects.filter(pk__in=ids).count(), 3)
+
+        response = self.client.delete(self.url, {'ids': ids}, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Todo.objects.filter(pk__in=ids).exists())
+        self.assertTrue(Todo.objects.filter(pk=self.foreign.pk).exists())
+
+    def test_bulk_toggle(self):
+        ids = [todo.pk for todo in self.todos]
+        response = self.client.patch(reverse('todo-bulk-toggle'), {'ids': ids, 'completed': True}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Todo.objects.filter(pk__in=ids, completed=True).count(), 5)
+
+        response = self.client.patch(
+            reverse('todo-bulk-toggle'), {'ids': [self.foreign.pk], 'completed': True}, format='json'
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Todo.objects.get(pk=self.foreign.pk).completed)
+
+
+@override_settings(TODO_SYNC_OVERLAP_SECONDS=0)
+class TodoSyncTests(QueryBudgetTestCase):
+    """Delta sync returns only what changed since the client's watermark"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        self.todos = [Todo.objects.create(title=f'Todo {i}', user=self.user) for i in range(3)]
+        Todo.objects.create(title='Not mine', user=self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('todo-sync')
+
+    def sync(self, since=None):
+        response = self.client.get(self.url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_first_sync_is_a_full_reset(self):
+        data = self.sync()
+        self.assertTrue(data['reset'])
+        self.assertEqual([todo['id'] for todo in data['todos']], [todo.pk for todo in self.todos])
+        self.assertEqual(data['deleted'], [])
+
+    def test_delta_contains_only_changes_and_tombstones(self):
+        watermark = self.sync()['watermark']
+        self.assertEqual(self.sync(watermark)['todos'], [])
+
+        self.client.patch(reverse('todo-detail', args=[self.todos[0].pk]), {'title': 'Edited'}, format='json')
+        self.client.delete(reverse('todo-detail', args=[self.todos[1].pk]))
+        created = self.client.post(reverse('todo-list'), {'title': 'New'}, format='json').data
+
+        with self.assertNumQueries(2):
+            data = self.sync(watermark)
+        self.assertFalse(data['reset'])
+        self.assertEqual([todo['id'] for todo in data['todos']], [self.todos[0].pk, created['id']])
+        self.assertEqual(data['deleted'], [self.todos[1].pk])
+        self.assertGreater(parse_datetime(data['watermark']), parse_datetime(watermark))
+
+        again = self.sync(data['watermark'])
+        self.assertEqual((again['todos'], again['deleted'], again['watermark']), ([], [], data['watermark']))
+
+    @override_settings(TODO_SYNC_OVERLAP_SECONDS=5)
+    def test_changes_committed_late_are_still_synced(self):
+        watermark = self.sync()['watermark']
+        # Stamped before the watermark, visible only after the client synced
+        stamped = parse_datetime(watermark) - timedelta(seconds=2)
+        Todo.objects.filter(pk=self.todos[0].pk).update(title='Late', updated_at=stamped)
+        self.client.delete(reverse('todo-detail', args=[self.todos[1].pk]))
+        TodoTombstone.objects.update(deleted_at=stamped)
+
+        # Along with whatever else changed within the overlap
+        data = self.sync(watermark)
+        self.assertIn('Late', [todo['title'] for todo in data['todos']])
+        self.assertEqual(data['deleted'], [self.todos[1].pk])
+        self.assertEqual(data['watermark'], watermark)
+
+    def test_bulk_delete_leaves_tombstones_and_owner_delete_does_not(self):
+        ids = [todo.pk for todo in self.todos[:2]]
+        with CaptureQueriesContext(connection) as queries:
+            self.client.delete(reverse('todo-bulk'), {'ids': ids}, format='json')
+        self.assertEqual(sorted(TodoTombstone.objects.values_list('todo_id', flat=True)), ids)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+
+        self.user.delete()
+        self.assertFalse(TodoTombstone.objects.exists())
+
+    def test_stale_or_invalid_watermark(self):
+        self.client.delete(reverse('todo-detail', args=[self.todos[0].pk]))
+        TodoTombstone.objects.update(deleted_at=timezone.now() - timedelta(days=40))
+        call_command('prune_todo_tombstones', stdout=StringIO())
+        self.assertFalse(TodoTombstone.objects.exists())
+
+        stale = (timezone.now() - timedelta(days=31)).isoformat()
+        data = self.sync(stale)
+        self.assertTrue(data['reset'])
+        self.assertEqual(len(data['todos']), 2)
+
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'since': '2026-01-01T00:00:00'}).status_code, 400)
+
+
+class TodoConditionalRequestTests(QueryBudgetTestCase):
+    """ETags let polling clients skip unchanged todos and guard edits"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.todo = Todo.objects.create(title='Poll me', user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('todo-detail', args=[self.todo.pk])
+
+    def test_unchanged_todo_and_list_are_not_modified(self):
+        # The todo's validators are read with one query; the list's are a
+        # version in the cache
+        for url, queries in ((self.url, 1), (reverse('todo-list'), 0)):
+            etag = self.client.get(url)['ETag']
+            with self.assertNumQueries(queries):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+        # A version says nothing about time: lists are validated by ETag only
+        self.assertNotIn('Last-Modified', response)
+
+        etag = self.client.get(reverse('todo-list'))['ETag']
+        self.client.delete(self.url)
+        self.assertEqual(self.client.get(reverse('todo-list'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_match_guards_updates(self):
+        etag = self.client.get(self.url)['ETag']
+        Todo.objects.filter(pk=self.todo.pk).update(title='Changed elsewhere', updated_at=timezone.now())
+        response = self.client.patch(self.url, {'completed': True}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.assertFalse(Todo.objects.get(pk=self.todo.pk).completed)
+
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'completed': True}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['ETag'])
+
+
+class TodoListCacheTests(QueryBudgetTestCase):
+    """List pages are cached per user and dropped as soon as the user's todos change"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='pass12345')
+        self.todo = Todo.objects.create(title='Cached', user=self.user)
+        Todo.objects.create(title='Not mine', user=self.other)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('todo-list')
+
+    def titles(self, params=None):
+        return [todo['title'] for todo in self.client.get(self.url, params).data['results']]
+
+    def test_second_request_is_served_from_cache(self):
+        self.assertEqual(self.titles(), ['Cached'])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.titles(), ['Cached'])
+        # Nothing reaches the database
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self.titles({'search': 'nothing'}), [])
+
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.titles(), ['Not mine'])
+
+    def test_changes_invalidate_only_the_owners_pages(self):
+        self.titles()
+        self.client.patch(reverse('todo-detail', args=[self.todo.pk]), {'title': 'Renamed'}, format='json')
+        self.assertEqual(self.titles(), ['Renamed'])
+
+        self.client.patch(reverse('todo-bulk-toggle'), {'ids': [self.todo.pk], 'completed': True}, format='json')
+        self.assertEqual(self.client.get(self.url).data['results'][0]['completed'], True)
+
+        self.client.post(reverse('todo-bulk'), [{'title': 'Bulk'}], format='json')
+        self.assertEqual(self.titles(), ['Bulk', 'Renamed'])
+
+        self.client.delete(reverse('todo-detail', args=[self.todo.pk]))
+        self.assertEqual(self.titles(), ['Bulk'])
+
+    def test_stats_count_hits_and_misses(self):
+        self.titles()
+        self.titles()
+        self.titles()
+        self.assertEqual(self.client.get(reverse('todo-cache-stats')).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(reverse('todo-cache-stats')).data
+        self.assertEqual(stats, {'hits': 2, 'misses': 1, 'hit_ratio': 0.6667})
+
+
+class TodoCompactListTests(QueryBudgetTestCase):
+    """Compact lists ship the owner once; the default path does not fetch it per row"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        for i in range(3):
+            Todo.objects.create(title=f'Todo {i}', user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_compact_representation(self):
+        for kwargs in ({'data': {'view': 'compact'}}, {'HTTP_ACCEPT': 'application/json; profile="compact"'}):
+            data = self.client.get(reverse('todo-list'), **kwargs).data
+            self.assertEqual(data['owner']['username'], 'owner')
+            self.assertEqual({todo['user_id'] for todo in data['results']}, {self.user.pk})
+            self.assertNotIn('user', data['results'][0])
+
+        data = self.client.get(reverse('todo-list')).data
+        self.assertNotIn('owner', data)
+        self.assertEqual(data['results'][0]['user']['username'], 'owner')
+
+    def test_default_list_joins_the_owner(self):
+        # The page, owner joined
+        with self.assertNumQueries(1):
+            self.client.get(reverse('todo-list'))
+
+
+class AsyncViewsClient(AsyncClient):
+    """AsyncClient serving the async views, like the ASGI application"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handler = type('Handler', (AsyncViewsHandlerMixin, AsyncClientHandler), {})(
+            self.handler.enforce_csrf_checks
+        )
+
+
+class TodoAsyncListTests(QueryBudgetTestCase):
+    """Under ASGI the list is served by an async view; WSGI and other actions stay sync"""
+    async_client_class = AsyncViewsClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='owner', email='owner@example.com', password='pass12345')
+        Todo.objects.create(title='Mine', user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_only_the_list_route_has_an_async_view(self):
+        view = resolve(reverse('todo-list')).func
+        self.assertFalse(iscoroutinefunction(view))
+        self.assertTrue(iscoroutinefunction(view.async_view))
+        self.assertFalse(hasattr(resolve(reverse('todo-toggle', args=[1])).func, 'async_view'))
+
+    async def test_session_authenticated_list_and_create(self):
+        response = await self.async_client.get(reverse('todo-list'))
+        self.assertEqual(response.status_code, 403)
+
+        await sync_to_async(self.async_client.force_login)(self.user)
+        response = await self.async_client.get(reverse('todo-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([todo['title'] for todo in response.data['results']], ['Mine'])
+
+        response = await self.async_client.get(reverse('todo-list'), headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.post(
+            reverse('todo-list'), {'title': 'Async'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        response = await self.async_client.get(reverse('todo-list'), {'completed': 'false'})
+        self.assertEqual([todo['title'] for todo in response.data['results']], ['Async', 'Mine'])
+
+
+class TodoQueryPlanTests(QueryBudgetTestCase):
+    """Each list filter is served from an index, newest first, without a sort"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='pass12345')
+
+    def test_list_filters_use_their_index(self):
+        cases = [
+            ({}, 'todos_user_created_idx'),
+            ({'completed': 'false'}, 'todos_user_open_idx'),
+            ({'completed': 'true'}, 'todos_user_done_idx'),
+            ({'due_date': '2030-01-01'}, 'todos_user_due_idx'),
+        ]
+        for params, index in cases:
+            with self.subTest(params=params):
+                plan = endpoint_queryset(TodoViewSet, 'list', self.user, params).explain()
+                self.assertEqual(full_scans(plan), [])
+                if connection.vendor == 'sqlite':
+                    self.assertIn(index, plan)
+                    self.assertNotIn('TEMP B-TREE', plan)
+
+
+class TodoInstrumentationTests(QueryBudgetTestCase):
+    """Requests report their queries and timings; actions stay within their query budget"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='pass12345')
+        Todo.objects.bulk_create([Todo(title=f'Todo {i}', user=self.user) for i in range(3)])
+        self.client = APIClient()
+        self.client.force_login(self.user)
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def test_server_timing_and_histogram(self):
+        response = self.client.get(reverse('todo-list'))
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=')
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(reverse('metrics')).data['TodoViewSet.list']
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['over_budget'], 0)
+        self.assertEqual(sum(stats['total']['buckets'].values()), 1)
+
+    def test_exceeding_the_budget_raises(self):
+        with mock.patch.object(TodoViewSet, 'query_budgets', {'list': 1}):
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse('todo-list'))
+
+
+class TodoSeedTests(QueryBudgetTestCase):
+    """`manage.py seed` loads usable rows, the same ones for the same seed"""
+
+    def seed(self, **options):
+        call_command('seed', users=3, todos=50, batch_size=20, stdout=StringIO(), **options)
+
+    def test_seeded_rows(self):
+        self.seed()
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Todo.objects.count(), 50)
+        user = User.objects.order_by('pk').first()
+        self.assertEqual(user.username, f'user{user.pk}')
+        self.assertTrue(user.check_password('password'))
+        self.assertTrue(Todo.objects.filter(user=user).exists())
+        self.assertTrue(Todo.objects.filter(due_date__isnull=False).exists())
+
+        # A second run appends after the existing rows, with the same content
+        self.seed()
+        self.assertEqual(User.objects.count(), 6)
+        todos = list(Todo.objects.order_by('pk').values_list('title', 'completed'))
+        self.assertEqual(todos[:50], todos[50:])
+        self.seed(seed=1)
+        self.assertNotEqual(
+            list(Todo.objects.order_by('pk').values_list('title', flat=True))[100:], [title for title, _ in todos[:50]]
+        )
@@ -1,24 +1,100 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_header_parameters
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import Todo
-from .serializers import TodoSerializer, TodoToggleSerializer
+from todo_api.async_views import AsyncViewSetMixin
+from todo_api.conditional import ConditionalRequestMixin
+from todo_api.instrumentation import InstrumentedViewMixin
+from todo_api.pagination import KeysetPagination
+from users.serializers import UserSerializer
+from . import cache as list_cache
+from .models import Todo, TodoTombstone
+from .serializers import (
+    BULK_MAX_ITEMS,
+    TodoSerializer,
+    TodoCompactSerializer,
+    TodoToggleSerializer,
+    TodoBulkIdsSerializer,
+    TodoBulkToggleSerializer,
+)
 from .permissions import IsOwnerOrReadOnly
+from .signals import batched_deletions
 
-class TodoViewSet(viewsets.ModelViewSet):
+class TodoViewSet(InstrumentedViewMixin, ConditionalRequestMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Todo model"""
     serializer_class = TodoSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['completed', 'due_date']
     search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'due_date', 'title']
+    ordering = ['-created_at']
+    async_actions = ('list',)
+    # Most queries per request, session and user lookups included
+    query_budgets = {
+        'list': 4, 'retrieve': 4, 'create': 3, 'update': 4, 'partial_update': 4,
+        'destroy': 5, 'sync': 4, 'bulk': 5,
+    }
     
     def get_queryset(self):
         """Return todos for the current user only"""
-        return Todo.objects.filter(user=self.request.user)
+        return Todo.objects.filter(user=self.request.user).select_related('user')
+    
+    def get_list_versions(self):
+        # Bumped with the list cache on every change to the user's todos
+        return [list_cache.list_version(self.request.user.pk)]
+    
+    def is_compact(self):
+        """``?view=compact`` or ``Accept: application/json; profile=compact``"""
+        if self.request.query_params.get('view') == 'compact':
+            return True
+        _, params = parse_header_parameters(self.request.accepted_media_type or '')
+        return params.get('profile') == 'compact'
+    
+    def get_serializer_class(self):
+        if self.action == 'list' and self.is_compact():
+            return TodoCompactSerializer
+        return TodoSerializer
+    
+    def list(self, request, *args, **kwargs):
+        """
+        Serve list pages from the per-user cache (see todos.cache).
+
+        The compact representation emits the owner once as ``owner`` and
+        only ``user_id`` on each row.
+        """
+        key = list_cache.page_key(request)
+        data = list_cache.get_page(key)
+        if data is None:
+            data = self.get_page_data(super().list(request, *args, **kwargs))
+            list_cache.set_page(key, data)
+        return Response(data)
+    
+    async def alist(self, request, *args, **kwargs):
+        """``list()`` for the async view"""
+        key = await list_cache.apage_key(request)
+        data = await list_cache.aget_page(key)
+        if data is None:
+            data = self.get_page_data(await super().alist(request, *args, **kwargs))
+            await list_cache.aset_page(key, data)
+        return Response(data)
+    
+    def get_page_data(self, response):
+        """The cacheable data of a list response"""
+        data = response.data
+        if self.is_compact():
+            envelope = data if isinstance(data, dict) else {'results': data}
+            data = {'owner': UserSerializer(self.request.user).data, **envelope}
+        return data
     
     @action(detail=True, methods=['patch'])
     def toggle(self, request, pk=None):
@@ -30,4 +106,122 @@ class TodoViewSet(viewsets.ModelViewSet):
         todo.completed = serializer.validated_data['completed']
         todo.save()
         
-        return Response(TodoSerializer(todo).data)
\ No newline at end of file
+        return Response(TodoSerializer(todo).data)
+
+    def missing_ids_response(self, ids):
+        """404 listing the ``ids`` the current user does not own, or None (one query)"""
+        owned = set(self.get_queryset().filter(pk__in=ids).values_list('pk', flat=True))
+        missing = [pk for pk in ids if pk not in owned]
+        if missing:
+            return Response({'detail': 'Todos not found.', 'ids': missing}, status=status.HTTP_404_NOT_FOUND)
+        return None
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """Create a list of todos in one transaction"""
+        serializer = self.get_serializer(data=request.data, many=True, max_length=BULK_MAX_ITEMS)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        """Partially update a list of todos, each identified by its ``id``"""
+        ids = [
+            item['id'] for item in request.data
+            if isinstance(item, dict) and isinstance(item.get('id'), int)
+        ] if isinstance(request.data, list) else []
+        todos = list(self.get_queryset().filter(pk__in=ids).select_related('user'))
+        serializer = self.get_serializer(
+            todos, data=request.data, many=True, partial=True, max_length=BULK_MAX_ITEMS
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        """Delete the todos listed in ``ids``"""
+        serializer = TodoBulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            error = self.missing_ids_response(ids)
+            if error:
+                return error
+            with batched_deletions():
+                self.get_queryset().filter(pk__in=ids).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['patch'])
+    def bulk_toggle(self, request):
+        """Set ``completed`` on every todo listed in ``ids`` with one UPDATE"""
+        serializer = TodoBulkToggleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        with transaction.atomic():
+            error = self.missing_ids_response(ids)
+            if error:
+                return error
+            self.get_queryset().filter(pk__in=ids).update(
+                completed=serializer.validated_data['completed'], updated_at=timezone.now()
+            )
+        # update() sends no signals
+        list_cache.invalidate_todo_lists(request.user.pk)
+        return Response({'ids': ids, 'completed': serializer.validated_data['completed']})
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """List cache hit/miss counters across all workers (staff only)"""
+        return Response(list_cache.get_stats())
+
+    @action(detail=False, methods=['get'])
+    def sync(self, request):
+        """
+        Todos changed and ids deleted since ``?since=<watermark>``.
+
+        Pass the returned ``watermark`` as ``since`` next time. Deltas
+        overlap by ``TODO_SYNC_OVERLAP_SECONDS``, so clients apply returned
+        todos as upserts and ignore deleted ids they no longer have. Without
+        ``since``, or when it predates tombstone retention, the response is
+        a full snapshot with ``reset: true`` and the client should replace
+        its local copy.
+        """
+        started = timezone.now()
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None or timezone.is_naive(since):
+                return Response(
+                    {'since': ['Expected a watermark returned by a previous sync.']},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        horizon = started - timedelta(days=settings.TODO_TOMBSTONE_RETENTION_DAYS)
+        reset = not since or since < horizon
+        todos = self.get_queryset().select_related('user').order_by('updated_at', 'pk')
+        deleted = []
+        if not reset:
+            after = since - timedelta(seconds=settings.TODO_SYNC_OVERLAP_SECONDS)
+            todos = todos.filter(updated_at__gt=after)
+            deleted = list(
+                TodoTombstone.objects.filter(user=request.user, deleted_at__gt=after)
+                .order_by('deleted_at').values_list('todo_id', 'deleted_at')
+            )
+        todos = list(todos)
+
+        # Never move backwards: the newest change returned, else where we started
+        watermark = max(
+            [todo.updated_at for todo in todos] + [deleted_at for _, deleted_at in deleted]
+            + ([] if reset else [since]),
+            default=started,
+        )
+        return Response({
+            'watermark': watermark.astimezone(dt_timezone.utc).isoformat().replace('+00:00', 'Z'),
+            'reset': reset,
+            'todos': TodoSerializer(todos, many=True).data,
+            'deleted': [todo_id for todo_id, _ in deleted],
+        })
@@ -1,3 +1,26 @@
-from django.test import TestCase
+from django.contrib.auth.hashers import get_hasher, make_password
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from todo_api.testing import QueryBudgetTestCase
+from .models import User
+
+
+class PasswordHashingTests(QueryBudgetTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.preferred = get_hasher().algorithm + '$'
+
+    def test_new_passwords_use_the_preferred_hasher(self):
+        user = User.objects.create_user(username='alice', email='alice@example.com', password='s3cret-pass')
+        self.assertTrue(user.password.startswith(self.preferred))
+
+    def test_login_rehashes_legacy_passwords(self):
+        user = User.objects.create(
+            username='alice', email='alice@example.com',
+            password=make_password('s3cret-pass', hasher='pbkdf2_sha256'),
+        )
+        response = self.client.post('/api/login/', {'username': 'alice', 'password': 's3cret-pass'})
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith(self.preferred))
+        self.assertTrue(user.check_password('s3cret-pass'))
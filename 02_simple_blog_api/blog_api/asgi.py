@@ -9,8 +9,12 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_api.settings')
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+from blog_api.async_views import AsyncViewsASGIHandler  # noqa: E402 (needs the app registry)
+
+# get_asgi_application(), but serving the async views of routes that have one
+application = AsyncViewsASGIHandler()
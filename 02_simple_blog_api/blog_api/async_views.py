@@ -0,0 +1,139 @@
+"""
+Async variants of DRF viewset actions, served when the project runs on ASGI.
+
+Under ASGI a sync DRF view holds a thread for its whole duration (Django
+runs it through ``sync_to_async``), while under WSGI an async view costs an
+``async_to_sync`` round trip per request and is slower than the sync one.
+So routes keep their sync view, and ``AsyncViewSetMixin`` gives the ones
+serving an action listed in ``async_actions`` a second, async view
+(``view.async_view``) whose dispatch calls the action's async variant
+``a<action>()``. ``AsyncViewsASGIHandler``, the ``application`` of
+``asgi.py``, serves that view; the WSGI application never sees it.
+
+The async dispatch
+
+* authenticates in a worker thread (session authentication has no async
+  API before Django 5.0);
+* awaits ``ainitial()`` hooks, e.g. the conditional-request validators;
+* leaves the database work of the handler to the async ORM (``aget``,
+  ``async for``) via ``aget_object()``, ``apaginate_queryset()`` and
+  ``alist()``.
+
+Other methods on those routes run the sync dispatch in a worker thread.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIHandler
+from django.http import Http404
+from rest_framework.response import Response
+
+
+async def aget_object_or_404(queryset, **filter_kwargs):
+    """``get_object_or_404()`` via ``aget()``; malformed lookups are a 404 too"""
+    try:
+        return await queryset.aget(**filter_kwargs)
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404
+
+
+class AsyncViewsHandlerMixin:
+    """Serves a route's ``async_view`` where it has one"""
+
+    def resolve_request(self, request):
+        match = super().resolve_request(request)
+        match.func = getattr(match.func, 'async_view', match.func)
+        return match
+
+
+class AsyncViewsASGIHandler(AsyncViewsHandlerMixin, ASGIHandler):
+    """``ASGIHandler`` serving the async views"""
+
+
+class AsyncViewSetMixin:
+    """
+    Lets viewset actions have an async variant, ``a<action>()``.
+
+    List the actions that have one in ``async_actions`` (``alist()`` is
+    provided). Put the mixin after mixins that add ``ainitial()`` hooks
+    (such as ``ConditionalRequestMixin``) and before the DRF viewset class.
+    """
+    async_actions = ()
+    # Set on the instances behind a route's async view
+    serve_async = False
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if set(actions.values()) & set(cls.async_actions):
+            view.async_view = markcoroutinefunction(super().as_view(actions, serve_async=True, **initkwargs))
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.serve_async:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        if action not in self.async_actions:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+        handler = getattr(self, f'a{action}')
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """``initial()`` with authentication awaited"""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        # Session authentication reads the session and user through the sync ORM
+        await sync_to_async(self.perform_authentication)(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def afilter_queryset(self, queryset):
+        """
+        ``filter_queryset()`` for async handlers.
+
+        django-filter validates relation filters (model choices) against the
+        database, so a request using any ``filterset_fields`` filters in a
+        worker thread.
+        """
+        if set(getattr(self, 'filterset_fields', ())) & set(self.request.query_params):
+            return await sync_to_async(self.filter_queryset)(queryset)
+        return self.filter_queryset(queryset)
+
+    async def aget_object(self):
+        queryset = await self.afilter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = await aget_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def alist(self, request, *args, **kwargs):
+        """``ListModelMixin.list()`` through the async ORM"""
+        queryset = await self.afilter_queryset(self.get_queryset())
+        page = await self.apaginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+        serializer = self.get_serializer([obj async for obj in queryset], many=True)
+        return Response(serializer.data)
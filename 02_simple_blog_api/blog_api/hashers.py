@@ -0,0 +1,45 @@
+"""
+Password hashing.
+
+``PASSWORD_HASHER`` in settings picks the algorithm new passwords are stored
+with: argon2 where argon2-cffi is installed, scrypt otherwise. Every other
+hasher stays installed so existing hashes keep verifying. A successful
+``authenticate()`` re-encodes a password whose hash uses another algorithm
+or other parameters (Django's ``check_password`` setter), so switching
+hashers or retuning them migrates users as they log in.
+
+The memory-hard hashers hold their working memory for the whole hash, and
+views hash on the request thread: a worker with T request threads needs up
+to T times the per-hash figure below on top of its baseline (4 threads with
+the tuned argon2: 76 MiB). ``manage.py benchmark_hashers`` reports time
+and memory per configuration.
+"""
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id at OWASP's baseline: 19 MiB, 2 passes, 1 lane (needs argon2-cffi).
+
+    About 40 ms per login, against about 290 ms for PBKDF2 at Django 4.2's
+    600,000 iterations and about 250 ms for Django's own argon2 parameters.
+    """
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt with N=2^14, r=8, p=5: 16 MiB per hash.
+
+    OWASP's minimum scrypt setting, and Django 5.2's default; Django 4.2's
+    default (p=1) makes one pass where OWASP asks for five. About 300 ms per
+    login, on a par with PBKDF2, so it is only the fallback for hosts
+    without argon2-cffi. OWASP's equivalent settings with more memory
+    (N=2^15, p=3 and up) took longer still.
+    """
+    work_factor = 2 ** 14
+    block_size = 8
+    parallelism = 5
+    maxmem = 2 * 128 * work_factor * block_size
@@ -0,0 +1,132 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination on ``(created_at, id)``.
+
+    Each cursor stores the sort value and primary key of the last row seen,
+    so every page is ``WHERE (created_at, id) < (%s, %s) ORDER BY ... LIMIT n``
+    and page 1000 costs the same as page one. No ``COUNT(*)`` is issued.
+
+    An ``?ordering=`` from the view's OrderingFilter is honoured when it names
+    a model field; the primary key is always the tiebreak. The sort fields
+    must not be nullable. Views with an OrderingFilter must set ``ordering``.
+    """
+    ordering = ('-created_at', '-pk')
+
+    def get_ordering(self, request, queryset, view):
+        field_name = super().get_ordering(request, queryset, view)[0]
+        try:
+            queryset.model._meta.get_field(field_name.lstrip('-'))
+        except FieldDoesNotExist:
+            # Only model fields can be read back off a row into a cursor
+            field_name = self.ordering[0]
+        tiebreak = '-pk' if field_name.startswith('-') else 'pk'
+        return (field_name, tiebreak)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        # Fetch one extra row to learn whether another page follows
+        return self.set_page(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """``paginate_queryset()`` through the async ORM"""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset[:self.page_size + 1]])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """The ordered, cursor-filtered queryset the page is sliced from"""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        ordering = [
+            field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering
+        ] if reverse else list(self.ordering)
+        name = ordering[0].lstrip('-')
+        descending = ordering[0].startswith('-')
+        field = queryset.model._meta.get_field(name)
+        queryset = queryset.order_by(*ordering)
+
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if descending else 'gt'
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(Q(**{f'{name}__{lookup}': value}) | Q(**{name: value, f'pk__{lookup}': pk}))
+        return queryset
+
+    def set_page(self, results):
+        """Keep the page out of ``page_size + 1`` fetched rows and note which links apply"""
+        reverse = bool(self.cursor and self.cursor.reverse)
+        has_position = bool(self.cursor and self.cursor.position is not None)
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = has_position, has_more
+        else:
+            self.has_next, self.has_previous = has_more, has_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _get_position_from_instance(self, instance, ordering):
+        return (str(getattr(instance, ordering[0].lstrip('-'))), instance.pk)
+
+    def encode_cursor(self, cursor):
+        value, pk = cursor.position
+        tokens = {'p': value, 'k': str(pk)}
+        if cursor.reverse:
+            tokens['r'] = '1'
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            tokens = parse.parse_qs(
+                b64decode(encoded.encode('ascii')).decode('utf-8'), keep_blank_values=True, strict_parsing=True
+            )
+            position = (tokens['p'][0], int(tokens['k'][0]))
+            reverse = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=position)
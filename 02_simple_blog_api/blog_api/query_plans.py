@@ -0,0 +1,145 @@
+"""
+Query planning for DRF views.
+
+A query plan is derived from a serializer's declared field tree: nested
+serializers over forward relations become ``select_related`` joins, nested
+serializers over to-many relations become ``Prefetch`` lookups (planned
+recursively), and serializers can declare ``query_annotations`` for values
+they would otherwise compute per row and ``query_prefetches`` for nested
+fields that read a filtered or sliced subset of a to-many relation.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import IntegerField, Prefetch, Subquery
+from rest_framework import serializers
+
+
+class SubqueryCount(Subquery):
+    """
+    ``COUNT(*)`` of a correlated subquery.
+
+    Unlike ``Count()`` over a join, this stays correct inside ``Prefetch``
+    querysets, where Django adds its own join on the same relation.
+    """
+    template = '(SELECT COUNT(*) FROM (%(subquery)s) _count)'
+    output_field = IntegerField()
+
+
+class QueryPlan:
+    """Eager-loading instructions for one serializer class"""
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []  # (lookup, base queryset, child plan, to_attr)
+        self.annotations = {}
+
+    def merge(self, prefix, plan):
+        """Fold a joined child's plan into this one under ``prefix``"""
+        self.select_related.append(prefix)
+        self.select_related.extend(f'{prefix}__{lookup}' for lookup in plan.select_related)
+        self.prefetch_related.extend(
+            (f'{prefix}__{lookup}', queryset, child, to_attr)
+            for lookup, queryset, child, to_attr in plan.prefetch_related
+        )
+
+    def apply(self, queryset):
+        """Return ``queryset`` with the planned joins, prefetches and annotations"""
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*[
+                Prefetch(lookup, queryset=plan.apply(queryset.all()), to_attr=to_attr)
+                for lookup, queryset, plan, to_attr in self.prefetch_related
+            ])
+        return queryset
+
+
+def _nested_serializer(field):
+    """Return (serializer, many) for nested serializer fields, else (None, False)"""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child, True
+    if isinstance(field, serializers.BaseSerializer):
+        return field, False
+    return None, False
+
+
+def _relation(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    return field if field.is_relation else None
+
+
+def _all(model):
+    return model._default_manager.all()
+
+
+@lru_cache(maxsize=None)
+def get_query_plan(serializer_class):
+    """Build (and memoize) the query plan for ``serializer_class``"""
+    return _build_plan(serializer_class())
+
+
+def _build_plan(serializer):
+    plan = QueryPlan()
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is None:
+        return plan
+
+    plan.annotations.update(getattr(serializer, 'query_annotations', {}))
+    prefetches = getattr(serializer, 'query_prefetches', {})
+
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+
+        nested, many = _nested_serializer(field)
+        if field.source in prefetches:
+            # Prefetched into ``to_attr=field.source``, which the field reads
+            lookup, queryset = prefetches[field.source]
+            child = _build_plan(nested) if nested is not None else QueryPlan()
+            plan.prefetch_related.append((lookup, queryset, child, field.source))
+            continue
+
+        relation = _relation(model, field.source_attrs[0])
+        if relation is None:
+            continue
+
+        if isinstance(field, serializers.ManyRelatedField):
+            plan.prefetch_related.append((field.source, _all(relation.related_model), QueryPlan(), None))
+            continue
+
+        if nested is None:
+            # Dotted sources such as ``author.username`` follow forward relations
+            if len(field.source_attrs) > 1 and not relation.many_to_many and not relation.one_to_many:
+                plan.select_related.append(field.source_attrs[0])
+            continue
+
+        child = _build_plan(nested)
+        if many or child.annotations:
+            plan.prefetch_related.append((field.source, _all(relation.related_model), child, None))
+        else:
+            plan.merge(field.source, child)
+
+    plan.select_related = list(dict.fromkeys(plan.select_related))
+    return plan
+
+
+class QueryPlanMixin:
+    """
+    View mixin that eager-loads whatever the current action's serializer reads.
+
+    ``query_plan_actions`` limits planning to the listed actions; ``None``
+    plans every request (the default for generic, non-viewset views).
+    """
+    query_plan_actions = None
+
+    def plan_queryset(self, queryset):
+        action = getattr(self, 'action', None)
+        if self.query_plan_actions is not None and action not in self.query_plan_actions:
+            return queryset
+        return get_query_plan(self.get_serializer_class()).apply(queryset)
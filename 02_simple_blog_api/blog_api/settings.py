@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'blog_api.instrumentation.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -103,6 +105,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: PASSWORD_HASHER picks the algorithm new passwords use,
+# argon2 where argon2-cffi is installed and scrypt otherwise. The rest stay
+# listed so existing hashes still verify; they are re-encoded with the
+# preferred hasher on the next login
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'scrypt')
+_PASSWORD_HASHERS = {
+    'argon2': 'blog_api.hashers.Argon2PasswordHasher',
+    'scrypt': 'blog_api.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -141,5 +157,13 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Seconds between batched writes of buffered post view counts
+POST_VIEW_COUNT_FLUSH_INTERVAL = 10
+
+# Raise instead of only logging when a view action runs more queries than its
+# query_budgets entry allows (QUERY_BUDGET_RAISE=1); tests turn it on through
+# blog_api.testing.QueryBudgetTestCase, whatever runs them
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE') == '1'
+
 # CORS Settings
 CORS_ALLOW_ALL_ORIGINS = True
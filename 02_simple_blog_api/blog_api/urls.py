@@ -19,6 +19,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
+from blog_api.instrumentation import MetricsView
 from posts.views import PostViewSet, CommentViewSet, PostSearchView
 from categories.views import CategoryViewSet
 from users.views import (
@@ -56,6 +57,9 @@ urlpatterns = [
     
     # Search
     path('api/search/', PostSearchView.as_view(), name='post-search'),
+    
+    # Per-action query counts and latencies (admins only)
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 # Serve media files in development
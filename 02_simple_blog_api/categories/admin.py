@@ -3,12 +3,9 @@ from .models import Category
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'slug', 'posts_count', 'created_at']
+    list_display = ['name', 'slug', 'posts_count', 'published_posts_count', 'created_at']
     list_filter = ['created_at']
     search_fields = ['name', 'description']
     prepopulated_fields = {'slug': ('name',)}
     ordering = ['name']
-    
-    def posts_count(self, obj):
-        return obj.posts.count()
-    posts_count.short_description = 'Posts Count'
+    readonly_fields = ['posts_count', 'published_posts_count']
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef
+from blog_api.query_plans import SubqueryCount
+from categories.models import Category
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized post counters of every category in a single UPDATE'
+
+    def handle(self, *args, **options):
+        links = Post.categories.through.objects.filter(category=OuterRef('pk'))
+        updated = Category.objects.update(
+            posts_count=SubqueryCount(links),
+            published_posts_count=SubqueryCount(links.filter(post__status='published')),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Recounted posts for {updated} categories'))
@@ -8,6 +8,9 @@ class Category(models.Model):
     description = models.TextField(blank=True)
     slug = models.SlugField(unique=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized counters maintained by posts.signals
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    published_posts_count = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         db_table = 'categories'
@@ -1,3 +1,80 @@
-from django.test import TestCase
+from io import StringIO
+from django.core.management import call_command
+from blog_api.testing import QueryBudgetTestCase
+from posts.models import Post
+from users.models import User
+from .models import Category
 
-# Create your tests here.
+
+class CategoryPostCountTests(QueryBudgetTestCase):
+    """Stored category counters follow post membership and status"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username='author', email='author@example.com', password='pass12345'
+        )
+        self.django = Category.objects.create(name='Django')
+        self.python = Category.objects.create(name='Python')
+
+    def create_post(self, title, status='draft'):
+        return Post.objects.create(title=title, content='Body', author=self.author, status=status)
+
+    def assertCounts(self, category, total, published):
+        category.refresh_from_db()
+        self.assertEqual((category.posts_count, category.published_posts_count), (total, published))
+
+    def test_forward_add_remove_and_clear(self):
+        post = self.create_post('One', status='published')
+        post.categories.add(self.django, self.python)
+        post.categories.add(self.django)
+        self.assertCounts(self.django, 1, 1)
+        self.assertCounts(self.python, 1, 1)
+
+        post.categories.remove(self.python)
+        post.categories.remove(self.python)
+        self.assertCounts(self.python, 0, 0)
+
+        post.categories.clear()
+        self.assertCounts(self.django, 0, 0)
+
+    def test_reverse_add_and_clear(self):
+        draft = self.create_post('Draft')
+        published = self.create_post('Published', status='published')
+        self.django.posts.add(draft, published)
+        self.assertCounts(self.django, 2, 1)
+
+        self.django.posts.clear()
+        self.assertCounts(self.django, 0, 0)
+
+    def test_status_flip(self):
+        post = self.create_post('Draft')
+        post.categories.set([self.django])
+        self.assertCounts(self.django, 1, 0)
+
+        post.status = 'published'
+        post.save()
+        self.assertCounts(self.django, 1, 1)
+
+        post.title = 'Renamed'
+        post.save()
+        self.assertCounts(self.django, 1, 1)
+
+        post.status = 'draft'
+        post.save(update_fields=['status'])
+        self.assertCounts(self.django, 1, 0)
+
+    def test_post_delete(self):
+        post = self.create_post('Gone', status='published')
+        post.categories.set([self.django, self.python])
+        post.delete()
+        self.assertCounts(self.django, 0, 0)
+        self.assertCounts(self.python, 0, 0)
+
+    def test_recount_command(self):
+        post = self.create_post('One', status='published')
+        post.categories.set([self.django])
+        Category.objects.update(posts_count=7, published_posts_count=7)
+
+        call_command('recount_category_posts', stdout=StringIO())
+        self.assertCounts(self.django, 1, 1)
+        self.assertCounts(self.python, 0, 0)
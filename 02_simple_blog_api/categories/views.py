@@ -1,16 +1,19 @@
 from django.shortcuts import render
 from rest_framework import viewsets, permissions
+from blog_api.instrumentation import InstrumentedViewMixin
 from .models import Category
 from .serializers import CategorySerializer, CategoryCreateSerializer
 
 # Create your views here.
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     """ViewSet for Category model"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = 'slug'
+    # Most queries per request, session and user lookups included
+    query_budgets = {'list': 4, 'retrieve': 3}
     
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
@@ -3,7 +3,7 @@ from .models import Post, Comment
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ['title', 'author', 'status', 'created_at', 'views_count']
+    list_display = ['title', 'author', 'status', 'created_at', 'views_count', 'likes_count']
     list_filter = ['status', 'created_at', 'categories', 'author']
     search_fields = ['title', 'content', 'author__username']
     prepopulated_fields = {'slug': ('title',)}
@@ -22,7 +22,7 @@ class PostAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
-    readonly_fields = ['created_at', 'updated_at', 'views_count']
+    readonly_fields = ['created_at', 'updated_at', 'views_count', 'likes_count']
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -0,0 +1,70 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from blog_api import benchmark
+from categories.models import Category
+from posts.models import Post
+from posts.view_counts import view_counts
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed users, categories, posts and comments into a throwaway test '
+        'database, then report throughput and p50/p95/p99 latency of the blog '
+        'endpoints through the test client and over HTTP against a local server'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users to seed')
+        parser.add_argument('--categories', type=int, default=20, help='Number of categories to seed')
+        parser.add_argument('--posts', type=int, default=5000, help='Number of posts to seed')
+        parser.add_argument('--comments', type=int, default=20000, help='Number of comments to seed')
+        benchmark.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        previous = benchmark.load(options['compare']) if options['compare'] else None
+        scale = {name: options[name] for name in ('users', 'categories', 'posts', 'comments')}
+        with benchmark.test_database():
+            try:
+                started = time.perf_counter()
+                user = self.seed(**scale)
+                seed_seconds = time.perf_counter() - started
+                seeded = ', '.join(f'{count} {name}' for name, count in scale.items())
+                self.stdout.write(f'Seeded {seeded} in {seed_seconds:.1f}s')
+                results = benchmark.run(self.get_endpoints(user), benchmark.session_headers(user), options)
+            finally:
+                # Buffered views of the benchmark's detail requests
+                view_counts.flush()
+        benchmark.report(self, results, previous, options, scale=scale, seed_seconds=seed_seconds)
+
+    def seed(self, users, categories, posts, comments):
+        # manage.py seed's bulk loader, which also recounts the counters and
+        # rebuilds the search index
+        call_command(
+            'seed', users=max(users, 1), categories=categories, posts=posts, comments=comments, stdout=StringIO(),
+        )
+        return User.objects.order_by('pk').first()
+
+    def get_endpoints(self, user):
+        post = Post.objects.filter(status='published').order_by('pk').first()
+        category = Category.objects.order_by('pk').first()
+        endpoints = [
+            ('post list', reverse('post-list')),
+            ('post list by author', f'{reverse("post-list")}?author={user.pk}'),
+            ('post list by category', f'{reverse("post-list")}?categories={category.pk}'),
+            ('comment list', reverse('comment-list')),
+            ('post search', f'{reverse("post-search")}?q=django'),
+            ('category list', reverse('category-list')),
+            ('user list', reverse('user-list')),
+        ]
+        if post is not None:
+            endpoints += [
+                ('post detail', reverse('post-detail', args=[post.slug])),
+                ('post comments', reverse('post-comments', args=[post.slug])),
+                ('comment list by post', f'{reverse("comment-list")}?post_id={post.pk}'),
+            ]
+        return endpoints
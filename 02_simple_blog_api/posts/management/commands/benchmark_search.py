@@ -0,0 +1,105 @@
+import itertools
+import random
+import statistics
+import string
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+from posts.models import Post
+from posts.search import get_search_backend
+from users.models import User
+
+WORDS = (
+    'django rest framework serializer viewset router queryset model field '
+    'migration index cache python async database query planner transaction '
+    'signal middleware template request response pagination filter search'
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare the old icontains search against the full-text index on '
+        'synthetic posts, inside a throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument(
+            '--queries', nargs='+',
+            default=['django', 'serial', 'cache index', 'async query planner', 'nomatch'],
+        )
+
+    def handle(self, *args, **options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options['posts'], random.Random(options['seed']))
+            self.run(options['queries'], options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def seed(self, count, rng):
+        # Zipf-distributed vocabulary: a few common words, a long tail of rare ones,
+        # with the queried words placed mid-frequency
+        filler = [
+            ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(20_000)
+        ]
+        vocabulary = filler[:1000] + WORDS + filler[1000:]
+        weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def text(words):
+            return ' '.join(rng.choices(vocabulary, cum_weights=weights, k=words))
+
+        author = User.objects.create_user(username='bench', email='bench@example.com', password='bench')
+        batch = []
+        for i in range(count):
+            batch.append(Post(
+                title=text(6),
+                slug=f'bench-post-{i}',
+                content=text(200),
+                excerpt=text(20),
+                author=author,
+                status='published',
+            ))
+            if len(batch) == 5000:
+                Post.objects.bulk_create(batch)
+                batch = []
+        Post.objects.bulk_create(batch)
+
+        started = time.perf_counter()
+        get_search_backend().rebuild()
+        self.stdout.write(f'Seeded {count} posts; index rebuilt in {time.perf_counter() - started:.2f}s')
+
+    def icontains(self, query):
+        # The pre-index PostSearchView query
+        return Post.objects.filter(status='published').filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(excerpt__icontains=query)
+        ).distinct()
+
+    def indexed(self, query):
+        return get_search_backend().search(Post.objects.filter(status='published'), query)
+
+    def time_page(self, queryset, repeat):
+        """Median milliseconds to fetch a count plus the first page, like the paginated view"""
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            queryset.count()
+            list(queryset[:10])
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
+
+    def run(self, queries, repeat):
+        self.stdout.write(f'{"query":<24}{"matches":>10}{"icontains ms":>15}{"index ms":>12}{"speedup":>10}')
+        for query in queries:
+            matches = self.indexed(query).count()
+            slow = self.time_page(self.icontains(query), repeat)
+            fast = self.time_page(self.indexed(query), repeat)
+            self.stdout.write(
+                f'{query:<24}{matches:>10}{slow:>15.1f}{fast:>12.1f}{slow / max(fast, 1e-6):>9.1f}x'
+            )
@@ -0,0 +1,72 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from blog_api.explain import endpoint_queryset, full_scans
+from categories.models import Category
+from categories.views import CategoryViewSet
+from posts.views import CommentViewSet, PostSearchView, PostViewSet
+from users.models import User
+from users.views import UserListView
+
+
+class Command(BaseCommand):
+    help = (
+        'Print the query plan of each endpoint\'s queryset and flag tables it '
+        'reads in full, against a throwaway test database'
+    )
+
+    # (label, table) pairs that read a whole table by design
+    expected_scans = {
+        # Streams every user, unpaginated
+        ('GET /api/users/', 'users'),
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true', help='Fail if any endpoint scans a whole table')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='explain', email='explain@example.com', password='explain')
+            Category.objects.create(name='Explain', slug='explain')
+            scanning = self.explain(self.get_endpoints(user))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        if scanning and options['strict']:
+            raise CommandError(f'Full table scans in: {", ".join(scanning)}')
+
+    def get_endpoints(self, user):
+        """(label, queryset) for each endpoint and filter combination worth watching"""
+        anonymous = AnonymousUser()
+        return [
+            ('GET /api/posts/ (anonymous)', endpoint_queryset(PostViewSet, 'list', anonymous)),
+            ('GET /api/posts/ (signed in)', endpoint_queryset(PostViewSet, 'list', user)),
+            ('GET /api/posts/?status=draft', endpoint_queryset(PostViewSet, 'list', user, {'status': 'draft'})),
+            ('GET /api/posts/?author=...', endpoint_queryset(PostViewSet, 'list', user, {'author': user.pk})),
+            ('GET /api/posts/?categories=...', endpoint_queryset(
+                PostViewSet, 'list', user, {'categories': Category.objects.get().pk}
+            )),
+            ('GET /api/posts/{slug}/', endpoint_queryset(PostViewSet, 'retrieve', anonymous, slug='explain')),
+            ('GET /api/comments/', endpoint_queryset(CommentViewSet, 'list', anonymous)),
+            ('GET /api/comments/?post_id=...', endpoint_queryset(CommentViewSet, 'list', anonymous, {'post_id': 1})),
+            ('GET /api/search/?q=...', endpoint_queryset(PostSearchView, user=anonymous, params={'q': 'django'})),
+            ('GET /api/categories/', endpoint_queryset(CategoryViewSet, 'list', anonymous)),
+            ('GET /api/users/', endpoint_queryset(UserListView, user=anonymous)),
+        ]
+
+    def explain(self, endpoints):
+        """Print each plan; return the labels of endpoints that scan a whole table"""
+        scanning = []
+        for label, queryset in endpoints:
+            plan = queryset.explain()
+            tables = [table for table in full_scans(plan) if (label, table) not in self.expected_scans]
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(plan)
+            if tables:
+                scanning.append(label)
+                self.stdout.write(self.style.WARNING(f'full scan: {", ".join(tables)}'))
+            self.stdout.write('')
+        return scanning
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from blog_api import benchmark, loadtest
+from categories.models import Category
+from posts.models import Comment, Post
+from posts.view_counts import view_counts
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare WSGI and ASGI serving of the post list and detail (async '
+        'views under ASGI) and the category list (sync either way), signed in: throughput and '
+        'p50/p99 latency per concurrency level, in-process against a '
+        'throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per run')
+        parser.add_argument('--wsgi-threads', type=int, default=16)
+        parser.add_argument('--posts', type=int, default=100)
+
+    def handle(self, *args, **options):
+        with benchmark.test_database():
+            try:
+                user = User.objects.create_user(username='bench', email='bench@example.com', password='bench')
+                categories = Category.objects.bulk_create([
+                    Category(name=f'Category {i}', slug=f'category-{i}') for i in range(5)
+                ])
+                posts = Post.objects.bulk_create([
+                    Post(title=f'Post {i}', slug=f'post-{i}', content='Body ' * 100, author=user, status='published')
+                    for i in range(options['posts'])
+                ])
+                Post.categories.through.objects.bulk_create([
+                    Post.categories.through(post=post, category=category)
+                    for post in posts for category in categories[:2]
+                ])
+                Comment.objects.bulk_create([
+                    Comment(post=posts[0], author=user, content=f'Comment {i}', is_approved=True) for i in range(10)
+                ])
+                endpoints = [
+                    ('post list', reverse('post-list')),
+                    ('post detail', reverse('post-detail', args=[posts[0].slug])),
+                    ('categories', reverse('category-list')),
+                ]
+                self.run(endpoints, benchmark.session_headers(user), options)
+            finally:
+                view_counts.flush()
+
+    def run(self, endpoints, headers, options):
+        self.stdout.write(
+            f'{"endpoint":<20}{"server":<7}{"conc":>6}{"req/s":>9}{"p50 ms":>9}{"p99 ms":>9}{"errors":>8}'
+        )
+        for label, path in endpoints:
+            for concurrency in options['concurrency']:
+                for server in ('wsgi', 'asgi'):
+                    result = loadtest.run(
+                        server, path, headers, concurrency=concurrency,
+                        requests=options['requests'], wsgi_threads=options['wsgi_threads'],
+                    )
+                    self.stdout.write(
+                        f'{label:<20}{server:<7}{concurrency:>6}{result.throughput:>9.1f}'
+                        f'{result.percentile(50) * 1000:>9.1f}{result.percentile(99) * 1000:>9.1f}{result.errors:>8}'
+                    )
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from posts.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = 'Create the post full-text index if needed and repopulate it from the posts table'
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.install()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt post search index ({type(backend).__name__})'))
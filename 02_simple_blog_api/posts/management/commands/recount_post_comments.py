@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef
+from blog_api.query_plans import SubqueryCount
+from posts.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute the approved comment counter of every post in a single UPDATE'
+
+    def handle(self, *args, **options):
+        updated = Post.objects.update(
+            approved_comments_count=SubqueryCount(Comment.objects.filter(post=OuterRef('pk'), is_approved=True)),
+        )
+        self.stdout.write(self.style.SUCCESS(f'Recounted approved comments for {updated} posts'))
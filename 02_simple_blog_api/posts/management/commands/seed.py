@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from blog_api import seeding
+from blog_api.seeding import bulk_load, next_id
+from categories.models import Category
+from posts.models import Comment, Post
+from users.models import User
+
+WORDS = (
+    'django', 'python', 'database', 'index', 'query', 'cache', 'server', 'request', 'latency', 'deploy',
+    'the', 'a', 'and', 'of', 'to', 'in', 'with', 'for', 'on', 'is', 'fast', 'slow', 'simple', 'scale',
+    'api', 'model', 'view', 'test', 'async', 'thread', 'memory', 'disk', 'network', 'page', 'table', 'row',
+)
+
+
+def user_rows(rng, start, stop, first_id, password, now):
+    rows = []
+    for i in range(start, stop):
+        pk = first_id + i
+        joined = now - timedelta(hours=rng.randrange(24 * 365 * 2))
+        rows.append((pk, f'user{pk}', f'user{pk}@example.com', password, joined))
+    return rows
+
+
+def post_rows(rng, start, stop, first_id, first_user, users, now):
+    rows = []
+    for i in range(start, stop):
+        pk = first_id + i
+        created = now - timedelta(hours=rng.randrange(24 * 365))
+        published = rng.random() < 0.8
+        content = ' '.join(rng.choices(WORDS, k=rng.randint(50, 400)))
+        rows.append((
+            pk,
+            ' '.join(rng.choices(WORDS, k=5)).capitalize(),
+            f'post-{pk}',
+            content,
+            content[:200],
+            first_user + rng.randrange(users),
+            'published' if published else 'draft',
+            created,
+            created,
+            created if published else None,
+            rng.randrange(1000),
+        ))
+    return rows
+
+
+def post_category_rows(rng, start, stop, first_post, category_ids):
+    rows = []
+    for i in range(start, stop):
+        for category_id in rng.sample(category_ids, min(len(category_ids), rng.randint(1, 3))):
+            rows.append((first_post + i, category_id))
+    return rows
+
+
+def comment_rows(rng, start, stop, first_post, posts, first_user, users, now):
+    rows = []
+    for _ in range(start, stop):
+        created = now - timedelta(hours=rng.randrange(24 * 365))
+        rows.append((
+            first_post + rng.randrange(posts),
+            first_user + rng.randrange(users),
+            ' '.join(rng.choices(WORDS, k=rng.randint(5, 40))).capitalize(),
+            created,
+            created,
+            rng.random() < 0.8,
+        ))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with synthetic users, categories, posts (with their '
+        'category links) and comments in batched multi-row inserts, then '
+        'recount category and comment counters and rebuild the search index; '
+        'deterministic per --seed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Number of users to create')
+        parser.add_argument('--categories', type=int, default=50, help='Number of categories to create')
+        parser.add_argument('--posts', type=int, default=100000, help='Number of posts to create')
+        parser.add_argument('--comments', type=int, default=500000, help='Number of comments to create')
+        seeding.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        with bulk_load(self, options) as insert:
+            self.seed(insert, options['users'], options['categories'], options['posts'], options['comments'],
+                      options)
+
+    def seed(self, insert, users, categories, posts, comments, options):
+        # Hashed once: every seeded user signs in with --password
+        password = make_password(options['password'])
+        now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        first_user = next_id(User)
+        insert(User, ['id', 'username', 'email', 'password', 'date_joined'], user_rows, users, first_user,
+               password, now)
+
+        first_category = next_id(Category)
+        category_ids = [
+            category.pk for category in Category.objects.bulk_create([
+                Category(name=f'Category {first_category + i}', slug=f'category-{first_category + i}')
+                for i in range(categories)
+            ], batch_size=options['batch_size'])
+        ]
+        if not users:
+            return
+
+        first_post = next_id(Post)
+        insert(
+            Post,
+            ['id', 'title', 'slug', 'content', 'excerpt', 'author', 'status', 'created_at', 'updated_at',
+             'published_at', 'views_count'],
+            post_rows, posts, first_post, first_user, users, now,
+        )
+        if category_ids:
+            insert(Post.categories.through, ['post', 'category'], post_category_rows, posts, first_post,
+                   category_ids)
+        if posts:
+            insert(Comment, ['post', 'author', 'content', 'created_at', 'updated_at', 'is_approved'],
+                   comment_rows, comments, first_post, posts, first_user, users, now)
+
+        # The raw inserts skipped the signals that keep these up to date
+        call_command('recount_category_posts', stdout=self.stdout)
+        call_command('recount_post_comments', stdout=self.stdout)
+        call_command('rebuild_search_index', stdout=self.stdout)
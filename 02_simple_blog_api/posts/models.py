@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction, IntegrityError
 from django.conf import settings
 from django.utils.text import slugify
 
@@ -21,10 +21,26 @@ class Post(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     published_at = models.DateTimeField(blank=True, null=True)
     views_count = models.PositiveIntegerField(default=0)
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by posts.signals; recount with manage.py recount_post_comments
+    approved_comments_count = models.PositiveIntegerField(default=0, editable=False)
+    # Bumped by every comment write: the post's validator for its comments
+    comments_version = models.PositiveIntegerField(default=0, editable=False)
     
     class Meta:
         db_table = 'posts'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the full list (signed-in readers, ?status=)
+            models.Index(fields=['-created_at', '-id'], name='posts_created_idx'),
+            # ... and of the public list, which only ever shows published posts
+            models.Index(
+                fields=['-created_at', '-id'], name='posts_published_created_idx',
+                condition=models.Q(status='published'),
+            ),
+            # ?author= on the list, newest first
+            models.Index(fields=['author', '-created_at', '-id'], name='posts_author_created_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -39,6 +55,21 @@ class Post(models.Model):
         if self.excerpt:
             return self.excerpt
         return self.content[:150] + '...' if len(self.content) > 150 else self.content
+    
+    def add_like(self, user):
+        """Like the post; return False if the user already liked it"""
+        try:
+            # A single INSERT; the unique constraint rejects duplicates
+            with transaction.atomic():
+                PostLike.objects.create(post=self, user=user)
+        except IntegrityError:
+            return False
+        return True
+    
+    def remove_like(self, user):
+        """Unlike the post; return False if there was no like to remove"""
+        deleted, _ = PostLike.objects.filter(post=self, user=user).delete()
+        return bool(deleted)
 
 class Comment(models.Model):
     """Comment model for blog posts"""
@@ -52,6 +83,34 @@ class Comment(models.Model):
     class Meta:
         db_table = 'comments'
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination and counts of a post's approved comments
+            models.Index(
+                fields=['post', '-created_at', '-id'], name='comments_approved_post_idx',
+                condition=models.Q(is_approved=True),
+            ),
+            # The comment list, which only shows approved comments
+            models.Index(
+                fields=['-created_at', '-id'], name='comments_approved_created_idx',
+                condition=models.Q(is_approved=True),
+            ),
+        ]
     
     def __str__(self):
         return f'Comment by {self.author.username} on {self.post.title}'
+
+
+class PostLike(models.Model):
+    """A user's like on a post (at most one per user and post)"""
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='likes')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='post_likes')
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'post_likes'
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user'], name='unique_post_like'),
+        ]
+    
+    def __str__(self):
+        return f'{self.user} likes {self.post}'
@@ -0,0 +1,178 @@
+"""
+Full-text search for posts.
+
+Each backend keeps a side index of post titles, content and excerpts in
+step with ``Post`` saves/deletes (see ``posts.signals``) and exposes the
+same interface:
+
+* ``install()`` creates the index if it does not exist (run on post_migrate)
+* ``index(post)`` / ``remove(post_id)`` keep a single row in sync
+* ``rebuild()`` repopulates the whole index in one statement
+* ``search(queryset, query)`` filters ``queryset`` to matching posts,
+  annotated with ``search_rank`` and ordered best match first
+
+Every word in the query must match, and each word is matched as a prefix,
+so partial input ("djan") already finds posts.
+"""
+import re
+
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_terms(query):
+    """Split user input into plain word tokens (drops operators and quotes)"""
+    return TERM_RE.findall(query or '')
+
+
+class IcontainsSearchBackend:
+    """Fallback for databases without a full-text index: unranked substring scan"""
+
+    def install(self):
+        pass
+
+    def index(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def search(self, queryset, query):
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        for term in terms:
+            queryset = queryset.filter(
+                Q(title__icontains=term) |
+                Q(content__icontains=term) |
+                Q(excerpt__icontains=term)
+            )
+        return queryset
+
+
+class SQLiteSearchBackend:
+    """SQLite FTS5 virtual table keyed by post id (``rowid``), ranked with bm25"""
+    table = 'posts_search'
+
+    def install(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5('
+                "title, content, excerpt, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            )
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, content, excerpt) VALUES (%s, %s, %s, %s)',
+                [post.pk, post.title, post.content, post.excerpt],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE rowid = %s', [post_id])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, content, excerpt) '
+                f'SELECT id, title, content, excerpt FROM {Post._meta.db_table}'
+            )
+
+    def search(self, queryset, query):
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        expression = ' '.join(f'"{term}"*' for term in terms)
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        # The IN subquery runs MATCH once; rank is then looked up by rowid
+        # for the matching posts only
+        matches = RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [expression])
+        rank = RawSQL(
+            f'SELECT rank FROM {self.table} WHERE {self.table} MATCH %s AND rowid = {post_table}.id',
+            [expression], output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank).order_by('search_rank')
+
+
+class PostgreSQLSearchBackend:
+    """Weighted ``tsvector`` side table with a GIN index, ranked with ts_rank"""
+    table = 'posts_search'
+    config = 'simple'
+
+    def _document_sql(self, title='%s', excerpt='%s', content='%s'):
+        """Weighted document built from placeholders (or column names)"""
+        return (
+            f"setweight(to_tsvector('{self.config}', {title}), 'A') || "
+            f"setweight(to_tsvector('{self.config}', {excerpt}), 'B') || "
+            f"setweight(to_tsvector('{self.config}', {content}), 'C')"
+        )
+
+    def install(self):
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                f'post_id bigint PRIMARY KEY REFERENCES {post_table} (id) ON DELETE CASCADE, '
+                'document tsvector NOT NULL)'
+            )
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {self.table}_document_idx ON {self.table} USING GIN (document)'
+            )
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table} (post_id, document) VALUES (%s, {self._document_sql()}) '
+                'ON CONFLICT (post_id) DO UPDATE SET document = EXCLUDED.document',
+                [post.pk, post.title, post.excerpt, post.content],
+            )
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {self.table} WHERE post_id = %s', [post_id])
+
+    def rebuild(self):
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        document = self._document_sql('title', 'excerpt', 'content')
+        with connection.cursor() as cursor:
+            cursor.execute(f'TRUNCATE {self.table}')
+            cursor.execute(
+                f'INSERT INTO {self.table} (post_id, document) SELECT id, {document} FROM {post_table}'
+            )
+
+    def search(self, queryset, query):
+        terms = parse_terms(query)
+        if not terms:
+            return queryset.none()
+        expression = ' & '.join(f'{term}:*' for term in terms)
+        tsquery = f"to_tsquery('{self.config}', %s)"
+        post_table = connection.ops.quote_name(Post._meta.db_table)
+        # Matched through the GIN index; documents are then ranked by primary key
+        matches = RawSQL(f'SELECT post_id FROM {self.table} WHERE document @@ {tsquery}', [expression])
+        rank = RawSQL(
+            f'SELECT ts_rank(document, {tsquery}) FROM {self.table} WHERE post_id = {post_table}.id',
+            [expression], output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank).order_by('-search_rank')
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgreSQLSearchBackend,
+}
+
+
+def get_search_backend():
+    """Return the search backend matching the default database"""
+    return BACKENDS.get(connection.vendor, IcontainsSearchBackend)()
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from blog_api.pagination import KeysetPagination
 from .models import Post, Comment
 from users.serializers import UserSerializer
 from categories.serializers import CategorySerializer
@@ -22,27 +23,44 @@ class PostListSerializer(serializers.ModelSerializer):
     author = UserSerializer(read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     excerpt = serializers.SerializerMethodField()
+    liked = serializers.SerializerMethodField()
     
     class Meta:
         model = Post
-        fields = ['id', 'title', 'slug', 'excerpt', 'author', 'categories', 'status', 'featured_image', 'created_at', 'views_count']
+        fields = ['id', 'title', 'slug', 'excerpt', 'author', 'categories', 'status', 'featured_image', 'created_at', 'views_count', 'likes_count', 'liked']
     
     def get_excerpt(self, obj):
         return obj.get_excerpt()
+    
+    def get_liked(self, obj):
+        # Annotated by the views for authenticated users
+        return getattr(obj, 'is_liked', False)
 
 class PostDetailSerializer(serializers.ModelSerializer):
     """Serializer for detailed post view"""
     author = UserSerializer(read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    # First page of approved comments; /posts/<slug>/comments/ pages through the rest
+    comments = CommentSerializer(source='first_comments', many=True, read_only=True)
     excerpt = serializers.SerializerMethodField()
+    liked = serializers.SerializerMethodField()
+    query_prefetches = {
+        'first_comments': (
+            'comments',
+            Comment.objects.filter(is_approved=True).order_by(*KeysetPagination.ordering)[:KeysetPagination.page_size],
+        ),
+    }
     
     class Meta:
         model = Post
-        fields = ['id', 'title', 'slug', 'content', 'excerpt', 'author', 'categories', 'status', 'featured_image', 'created_at', 'updated_at', 'published_at', 'views_count', 'comments']
+        fields = ['id', 'title', 'slug', 'content', 'excerpt', 'author', 'categories', 'status', 'featured_image', 'created_at', 'updated_at', 'published_at', 'views_count', 'likes_count', 'liked', 'approved_comments_count', 'comments']
     
     def get_excerpt(self, obj):
         return obj.get_excerpt()
+    
+    def get_liked(self, obj):
+        # Annotated by the views for authenticated users
+        return getattr(obj, 'is_liked', False)
 
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating and updating posts"""
@@ -0,0 +1,173 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.signals import m2m_changed, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from blog_api.conditional import bump_list_version
+from categories.models import Category
+from .models import Comment, Post, PostLike
+from .search import get_search_backend
+
+PostCategory = Post.categories.through
+
+
+def adjust_category_counts(category_ids, total=0, published=0):
+    """Shift the denormalized post counters of the given categories in one UPDATE"""
+    if not category_ids or not (total or published):
+        return
+    Category.objects.filter(pk__in=category_ids).update(
+        posts_count=F('posts_count') + total,
+        published_posts_count=F('published_posts_count') + published,
+    )
+
+
+@receiver(m2m_changed, sender=PostCategory)
+def update_counts_on_categories_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep category counters in step with the post/category join table"""
+    if action == 'post_add':
+        # pk_set only holds links that did not exist before
+        links = PostCategory.objects.filter(category=instance, post_id__in=pk_set) if reverse else None
+    elif action in ('pre_remove', 'pre_clear'):
+        # Count the links about to be deleted, inside the same transaction
+        links = PostCategory.objects.filter(**({'category': instance} if reverse else {'post': instance}))
+        if action == 'pre_remove':
+            links = links.filter(**({'post_id__in': pk_set} if reverse else {'category_id__in': pk_set}))
+    else:
+        return
+
+    sign = 1 if action == 'post_add' else -1
+    if reverse:
+        # One category gained or lost several posts
+        total = links.count()
+        published = links.filter(post__status='published').count()
+        adjust_category_counts([instance.pk], sign * total, sign * published)
+    else:
+        # One post joined or left several categories
+        if action == 'post_add':
+            category_ids = list(pk_set)
+        else:
+            category_ids = list(links.values_list('category_id', flat=True))
+        published = sign if instance.status == 'published' else 0
+        adjust_category_counts(category_ids, sign, published)
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_status(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (update_fields is not None and 'status' not in update_fields):
+        instance._previous_status = None
+        return
+    instance._previous_status = (
+        Post.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Post)
+def update_counts_on_status_change(sender, instance, created, **kwargs):
+    """Move a post between published and unpublished totals when its status flips"""
+    previous = getattr(instance, '_previous_status', None)
+    if created or previous is None or previous == instance.status:
+        return
+    if 'published' not in (previous, instance.status):
+        return
+    delta = 1 if instance.status == 'published' else -1
+    category_ids = list(instance.categories.values_list('pk', flat=True))
+    adjust_category_counts(category_ids, published=delta)
+
+
+@receiver(pre_delete, sender=Post)
+def update_counts_on_post_delete(sender, instance, **kwargs):
+    """Cascade deletes of join rows do not send m2m_changed"""
+    category_ids = list(instance.categories.values_list('pk', flat=True))
+    published = -1 if instance.status == 'published' else 0
+    adjust_category_counts(category_ids, total=-1, published=published)
+
+
+@receiver(post_save, sender=PostLike)
+def increment_likes_count(sender, instance, created, **kwargs):
+    if created:
+        Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') + 1)
+
+
+@receiver(post_delete, sender=PostLike)
+def decrement_likes_count(sender, instance, **kwargs):
+    """Also covers likes removed by cascades from deleted users"""
+    Post.objects.filter(pk=instance.post_id).update(likes_count=F('likes_count') - 1)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=PostLike)
+@receiver(post_delete, sender=PostLike)
+@receiver(m2m_changed, sender=PostCategory)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def bump_posts_version(sender, **kwargs):
+    """Post lists show likes, categories and their counters: any change is a new version"""
+    if kwargs.get('action', 'post_').startswith('post_'):
+        bump_list_version('posts')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def bump_comments_version(sender, **kwargs):
+    bump_list_version('comments')
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def bump_users_version(sender, update_fields=None, **kwargs):
+    """Lists embed their authors; logging in changes nothing they show"""
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        bump_list_version('users')
+
+
+@receiver(pre_save, sender=Comment)
+def remember_previous_approval(sender, instance, update_fields=None, **kwargs):
+    if instance.pk is None or (update_fields is not None and 'is_approved' not in update_fields):
+        instance._previous_approved = None
+        return
+    instance._previous_approved = (
+        Comment.objects.filter(pk=instance.pk).values_list('is_approved', flat=True).first()
+    )
+
+
+def adjust_comment_counts(post_id, approved=0):
+    """Shift a post's approved comment counter and bump its comments version in one UPDATE"""
+    Post.objects.filter(pk=post_id).update(
+        approved_comments_count=F('approved_comments_count') + approved,
+        comments_version=F('comments_version') + 1,
+    )
+
+
+@receiver(post_save, sender=Comment)
+def update_counts_on_comment_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_approved', None)
+    if created:
+        approved = 1 if instance.is_approved else 0
+    elif previous is None or previous == instance.is_approved:
+        approved = 0
+    else:
+        approved = 1 if instance.is_approved else -1
+    adjust_comment_counts(instance.post_id, approved)
+
+
+@receiver(post_delete, sender=Comment)
+def update_counts_on_comment_delete(sender, instance, **kwargs):
+    """Also covers comments removed by cascades from deleted users"""
+    adjust_comment_counts(instance.post_id, -1 if instance.is_approved else 0)
+
+
+def install_search_index(sender, **kwargs):
+    """Connected to post_migrate by PostsConfig.ready"""
+    get_search_backend().install()
+
+
+@receiver(post_save, sender=Post)
+def index_post_for_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'content', 'excerpt'} & set(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_post_from_search(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
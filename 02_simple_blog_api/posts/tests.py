@@ -1,3 +1,397 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.client import AsyncClientHandler
+from django.urls import resolve, reverse
+from rest_framework.test import APIClient
+from blog_api.async_views import AsyncViewsHandlerMixin
+from blog_api.explain import endpoint_queryset, full_scans
+from blog_api.testing import QueryBudgetTestCase
+from categories.models import Category
+from users.models import User
+from .models import Post, Comment, PostLike
+from .view_counts import ViewCountBuffer, view_counts
+from .views import CommentViewSet, PostViewSet
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class PostQueryCountTests(QueryBudgetTestCase):
+    """Post endpoints must cost a constant number of queries per page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        categories = [
+            Category.objects.create(name=f'Category {i}', slug=f'category-{i}')
+            for i in range(3)
+        ]
+        for i in range(10):
+            author = User.objects.create_user(
+                username=f'author{i}', email=f'author{i}@example.com', password='pass12345'
+            )
+            post = Post.objects.create(
+                title=f'Django post {i}', content='Body ' * 50,
+                author=author, status='published'
+            )
+            post.categories.set(categories)
+            for j in range(3):
+                Comment.objects.create(post=post, author=author, content=f'Comment {j}', is_approved=True)
+        cls.post = post
+
+    def setUp(self):
+        self.client = APIClient()
+        self.addCleanup(view_counts.flush)
+
+    def test_list_query_count(self):
+        # posts, authors, categories (list validators are cached versions;
+        # keyset pagination issues no COUNT)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 10)
+        first = response.data['results'][0]
+        self.assertEqual(first['author']['posts_count'], 1)
+        self.assertEqual([c['posts_count'] for c in first['categories']], [10, 10, 10])
+
+    def test_retrieve_query_count(self):
+        # validators, post, author, categories, comments, comment authors
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse('post-detail', kwargs={'slug': self.post.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['comments']), 3)
+        self.assertEqual(response.data['comments'][0]['author']['posts_count'], 1)
+
+    def test_search_query_count(self):
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('post-search'), {'q': 'django', 'category': 'category-0'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 10)
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class PostCommentThreadTests(QueryBudgetTestCase):
+    """Post detail embeds one page of approved comments; the thread endpoint pages the rest"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        cls.post = Post.objects.create(title='Popular', content='Body', author=author, status='published')
+        for i in range(25):
+            Comment.objects.create(post=cls.post, author=author, content=f'Comment {i}', is_approved=True)
+        for i in range(5):
+            Comment.objects.create(post=cls.post, author=author, content=f'Pending {i}')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.addCleanup(view_counts.flush)
+
+    def test_detail_embeds_first_page_and_count(self):
+        response = self.client.get(reverse('post-detail', kwargs={'slug': self.post.slug}))
+        self.assertEqual(response.data['approved_comments_count'], 25)
+        self.assertEqual(
+            [comment['content'] for comment in response.data['comments']],
+            [f'Comment {i}' for i in range(24, 14, -1)],
+        )
+
+    def test_thread_pages_through_approved_comments(self):
+        url = reverse('post-comments', kwargs={'slug': self.post.slug})
+        contents = []
+        while url:
+            # post, comments, comment authors
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            contents.extend(comment['content'] for comment in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(contents, [f'Comment {i}' for i in range(24, -1, -1)])
+
+    def test_approved_count_is_stored_and_kept_up_to_date(self):
+        pending = Comment.objects.filter(post=self.post, is_approved=False).first()
+        pending.is_approved = True
+        pending.save()
+        Comment.objects.filter(post=self.post, is_approved=True).first().delete()
+        Comment.objects.create(post=self.post, author=self.post.author, content='Pending')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.approved_comments_count, 25)
+
+        Post.objects.filter(pk=self.post.pk).update(approved_comments_count=0)
+        call_command('recount_post_comments', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.approved_comments_count, 25)
+
+    def test_thread_hides_unpublished_posts(self):
+        draft = Post.objects.create(title='Draft', content='Body', author=self.post.author)
+        response = self.client.get(reverse('post-comments', kwargs={'slug': draft.slug}))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class ViewCountBufferTests(QueryBudgetTestCase):
+    """Views are buffered in memory and written back in one UPDATE"""
+
+    def setUp(self):
+        author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.posts = [
+            Post.objects.create(title=f'Post {i}', content='Body', author=author, status='published')
+            for i in range(3)
+        ]
+
+    def test_flush_writes_all_posts_in_one_query(self):
+        buffer = ViewCountBuffer()
+        buffer.increment(self.posts[0].pk)
+        buffer.increment(self.posts[0].pk)
+        buffer.increment(self.posts[2].pk, amount=5)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 2)
+        self.assertEqual(
+            [post.views_count for post in Post.objects.order_by('pk')], [2, 0, 5]
+        )
+        self.assertEqual(buffer.pending(), {})
+        with self.assertNumQueries(0):
+            self.assertEqual(buffer.flush(), 0)
+
+    def test_retrieve_buffers_view(self):
+        post = self.posts[1]
+        self.addCleanup(view_counts.flush)
+        response = APIClient().get(reverse('post-detail', kwargs={'slug': post.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(view_counts.pending(), {post.pk: 1})
+
+        view_counts.flush()
+        post.refresh_from_db()
+        self.assertEqual(post.views_count, 1)
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class PostLikeTests(QueryBudgetTestCase):
+    """Likes are idempotent and kept in a counter on the post"""
+
+    def setUp(self):
+        author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.reader = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        self.post = Post.objects.create(title='Liked post', content='Body', author=author, status='published')
+        Post.objects.create(title='Other post', content='Body', author=author, status='published')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+        self.url = reverse('post-like', kwargs={'slug': self.post.slug})
+
+    def test_like_is_idempotent(self):
+        for _ in range(2):
+            response = self.client.post(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['likes_count'], 1)
+        self.assertEqual(PostLike.objects.filter(post=self.post).count(), 1)
+
+    def test_unlike_is_idempotent(self):
+        self.post.add_like(self.reader)
+        for _ in range(2):
+            response = self.client.delete(self.url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['likes_count'], 0)
+
+    def test_deleting_user_releases_likes(self):
+        self.post.add_like(self.reader)
+        self.reader.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_list_flags_liked_posts_without_extra_queries(self):
+        self.client.post(self.url)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-list'))
+        liked = {post['slug']: (post['liked'], post['likes_count']) for post in response.data['results']}
+        self.assertEqual(liked, {'liked-post': (True, 1), 'other-post': (False, 0)})
+
+
+class PostSearchIndexTests(QueryBudgetTestCase):
+    """The full-text index follows post saves/deletes and ranks matches"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        self.url = reverse('post-search')
+
+    def create_post(self, title, content='Body'):
+        return Post.objects.create(title=title, content=content, author=self.author, status='published')
+
+    def search(self, q):
+        response = APIClient().get(self.url, {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.data['results']]
+
+    def test_prefix_match_and_ranking(self):
+        self.create_post('Cooking pasta', content='Mentions serializers once')
+        self.create_post('Serializers in depth', content='Serializers, serializers and more serializers')
+        self.assertEqual(self.search('serial'), ['Serializers in depth', 'Cooking pasta'])
+        self.assertEqual(self.search('serial pasta'), ['Cooking pasta'])
+        self.assertEqual(self.search('"unbalanced'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        post = self.create_post('Old title')
+        post.title = 'New title'
+        post.save()
+        self.assertEqual(self.search('old'), [])
+        self.assertEqual(self.search('new'), ['New title'])
+
+        post.delete()
+        self.assertEqual(self.search('new'), [])
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class PostConditionalRequestTests(QueryBudgetTestCase):
+    """Unchanged posts are answered with 304 from one query; stale writes get 412"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        cls.post = Post.objects.create(
+            title='Cached', slug='cached', content='Body', author=cls.author, status='published'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+        self.addCleanup(view_counts.flush)
+        self.url = reverse('post-detail', kwargs={'slug': self.post.slug})
+
+    def test_retrieve_not_modified(self):
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        Comment.objects.create(post=self.post, author=self.author, content='New')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_not_modified_until_a_post_changes(self):
+        etag = self.client.get(reverse('post-list'))['ETag']
+        # The list version is read from the cache
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('post-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+        self.post.add_like(self.author)
+        response = self.client.get(reverse('post-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_changes_when_an_older_post_is_deleted(self):
+        newer = Post.objects.create(title='Newer', slug='newer', content='Body', author=self.author)
+        etag = self.client.get(reverse('post-list'))['ETag']
+        # Leaves the newest updated_at as it was
+        self.post.delete()
+        response = self.client.get(reverse('post-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['slug'] for row in response.data['results']], [newer.slug])
+
+    def test_if_match_rejects_stale_writes(self):
+        etag = self.client.get(self.url)['ETag']
+        response = self.client.patch(self.url, {'title': 'First'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        response = self.client.patch(self.url, {'title': 'Second'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, 412)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.title, 'First')
+
+
+class AsyncViewsClient(AsyncClient):
+    """AsyncClient serving the async views, like the ASGI application"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handler = type('Handler', (AsyncViewsHandlerMixin, AsyncClientHandler), {})(
+            self.handler.enforce_csrf_checks
+        )
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=None)
+class PostAsyncViewTests(QueryBudgetTestCase):
+    """Under ASGI post list and detail are async views; WSGI and other actions stay sync"""
+    async_client_class = AsyncViewsClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        cls.published = Post.objects.create(title='Published', content='Body', author=cls.author, status='published')
+        cls.draft = Post.objects.create(title='Draft', content='Body', author=cls.author, status='draft')
+
+    def setUp(self):
+        self.addCleanup(view_counts.flush)
+
+    def test_list_and_detail_routes_have_async_views(self):
+        for url in (reverse('post-list'), reverse('post-detail', args=[self.published.slug])):
+            view = resolve(url).func
+            self.assertFalse(iscoroutinefunction(view))
+            self.assertTrue(iscoroutinefunction(view.async_view))
+        self.assertFalse(hasattr(resolve(reverse('post-like', args=[self.published.slug])).func, 'async_view'))
+
+    async def test_anonymous_and_authenticated_reads(self):
+        response = await self.async_client.get(reverse('post-list'))
+        self.assertEqual([post['title'] for post in response.data['results']], ['Published'])
+        response = await self.async_client.get(reverse('post-detail', args=[self.draft.slug]))
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(reverse('post-comments', args=[self.published.slug]))
+        self.assertEqual(response.data['results'], [])
+
+        await sync_to_async(self.async_client.force_login)(self.author)
+        response = await self.async_client.get(reverse('post-list'), {'author': self.author.pk})
+        self.assertEqual(len(response.data['results']), 2)
+        response = await self.async_client.get(reverse('post-list'), {'author': 999})
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.get(reverse('post-detail', args=[self.draft.slug]))
+        self.assertEqual(response.data['title'], 'Draft')
+        self.assertEqual(view_counts.pending(), {self.draft.pk: 1})
+
+        response = await self.async_client.patch(
+            reverse('post-detail', args=[self.draft.slug]), {'title': 'Edited'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+class QueryPlanTests(QueryBudgetTestCase):
+    """List filters are served from an index, newest first, without a sort"""
+
+    def test_list_filters_use_their_index(self):
+        user = User.objects.create_user(username='author', email='author@example.com', password='pass12345')
+        cases = [
+            (PostViewSet, AnonymousUser(), {}, 'posts_published_created_idx'),
+            (PostViewSet, user, {}, 'posts_created_idx'),
+            (PostViewSet, user, {'author': user.pk}, 'posts_author_created_idx'),
+            (CommentViewSet, AnonymousUser(), {}, 'comments_approved_created_idx'),
+            (CommentViewSet, AnonymousUser(), {'post_id': 1}, 'comments_approved_post_idx'),
+        ]
+        for view_class, reader, params, index in cases:
+            with self.subTest(view=view_class.__name__, params=params):
+                plan = endpoint_queryset(view_class, 'list', reader, params).explain()
+                self.assertEqual(full_scans(plan), [])
+                if connection.vendor == 'sqlite':
+                    self.assertIn(index, plan)
+                    self.assertNotIn('TEMP B-TREE', plan)
+
+
+class SeedCommandTests(QueryBudgetTestCase):
+    """`manage.py seed` leaves linked, counted and searchable posts behind"""
+
+    def test_seeded_posts(self):
+        call_command('seed', users=5, categories=4, posts=60, comments=100, batch_size=25, stdout=StringIO())
+        self.assertEqual((User.objects.count(), Post.objects.count(), Comment.objects.count()), (5, 60, 100))
+        self.assertFalse(Post.objects.filter(categories=None).exists())
+        for category in Category.objects.all():
+            self.assertEqual(category.posts_count, category.posts.count())
+            self.assertEqual(category.published_posts_count, category.posts.filter(status='published').count())
+
+        response = APIClient().get(reverse('post-search'), {'q': 'django'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['results'])
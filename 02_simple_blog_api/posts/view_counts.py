@@ -0,0 +1,74 @@
+"""
+Buffered view counting for posts.
+
+Retrieving a post only bumps an in-process counter; the buffer is written
+back every ``POST_VIEW_COUNT_FLUSH_INTERVAL`` seconds (and at interpreter
+exit) as a single ``UPDATE ... SET views_count = views_count + CASE ...``.
+"""
+import atexit
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+from .models import Post
+
+
+class ViewCountBuffer:
+    """Thread-safe accumulator of pending post view increments"""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, 'POST_VIEW_COUNT_FLUSH_INTERVAL', 10)
+
+    def increment(self, post_id, amount=1):
+        with self._lock:
+            self._counts[post_id] += amount
+            if self._timer is None and self.flush_interval:
+                self._timer = threading.Timer(self.flush_interval, self._flush_from_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def pending(self):
+        with self._lock:
+            return dict(self._counts)
+
+    def flush(self):
+        """Write all pending increments in one statement; return the number of posts touched"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return 0
+
+        increment = Case(
+            *[When(pk=post_id, then=Value(amount)) for post_id, amount in counts.items()],
+            default=Value(0),
+            output_field=PositiveIntegerField(),
+        )
+        try:
+            Post.objects.filter(pk__in=counts).update(views_count=F('views_count') + increment)
+        except Exception:
+            # Put the increments back so the next flush retries them
+            with self._lock:
+                self._counts.update(counts)
+            raise
+        return len(counts)
+
+    def _flush_from_timer(self):
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._timer = None
+            connections.close_all()
+
+
+view_counts = ViewCountBuffer()
+atexit.register(view_counts.flush)
@@ -3,8 +3,13 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
-from .models import Post, Comment
+from django.db.models import Exists, OuterRef
+from blog_api.async_views import AsyncViewSetMixin
+from blog_api.conditional import ConditionalRequestMixin
+from blog_api.instrumentation import InstrumentedViewMixin
+from blog_api.pagination import KeysetPagination
+from blog_api.query_plans import QueryPlanMixin, get_query_plan
+from .models import Post, Comment, PostLike
 from .serializers import (
     PostListSerializer, 
     PostDetailSerializer, 
@@ -13,8 +18,18 @@ from .serializers import (
     CommentCreateSerializer
 )
 from .permissions import IsAuthorOrReadOnly, IsCommentAuthorOrReadOnly
+from .search import get_search_backend
+from .view_counts import view_counts
 
-class PostViewSet(viewsets.ModelViewSet):
+def annotate_liked(queryset, user):
+    """Flag the posts ``user`` has liked via an EXISTS subquery (no per-row lookups)"""
+    if not user.is_authenticated:
+        return queryset
+    return queryset.annotate(
+        is_liked=Exists(PostLike.objects.filter(post=OuterRef('pk'), user=user))
+    )
+
+class PostViewSet(InstrumentedViewMixin, ConditionalRequestMixin, QueryPlanMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Post model"""
     queryset = Post.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly]
@@ -22,14 +37,34 @@ class PostViewSet(viewsets.ModelViewSet):
     filterset_fields = ['status', 'author', 'categories']
     search_fields = ['title', 'content', 'excerpt']
     ordering_fields = ['created_at', 'updated_at', 'title', 'views_count']
+    ordering = ['-created_at']
     lookup_field = 'slug'
+    async_actions = ('list', 'retrieve', 'comments')
+    pagination_class = KeysetPagination
+    query_plan_actions = ['list', 'retrieve']
+    # Most queries per request, session and user lookups included
+    query_budgets = {'list': 8, 'retrieve': 8, 'comments': 5}
+    # View counts are left out on purpose: they are not an edit
+    validator_fields = ('updated_at', 'likes_count', 'comments_version')
+    # Rows show their author (with a post count) and categories; see posts.signals
+    list_versions = ('posts', 'users')
     
-    def get_queryset(self):
+    def get_visible_posts(self):
         """Return published posts for public, all posts for authenticated users"""
         if self.request.user.is_authenticated:
             return Post.objects.all()
         return Post.objects.filter(status='published')
     
+    def get_queryset(self):
+        queryset = self.get_visible_posts()
+        if self.action in ['list', 'retrieve']:
+            queryset = annotate_liked(queryset, self.request.user)
+        return self.plan_queryset(queryset)
+    
+    def get_validator_queryset(self):
+        # Validators are columns of the post row: no joins or subqueries
+        return self.get_visible_posts()
+    
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return PostCreateUpdateSerializer
@@ -37,6 +72,38 @@ class PostViewSet(viewsets.ModelViewSet):
             return PostDetailSerializer
         return PostListSerializer
     
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        # Buffered; written back in batches by posts.view_counts
+        view_counts.increment(instance.pk)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
+    async def aretrieve(self, request, *args, **kwargs):
+        """``retrieve()`` for the async view"""
+        instance = await self.aget_object()
+        view_counts.increment(instance.pk)
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'])
+    def comments(self, request, slug=None):
+        """Approved comments of a post, newest first, cursor-paginated"""
+        post = self.get_object()
+        page = self.paginate_queryset(self.get_comments_queryset(post))
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+    
+    async def acomments(self, request, slug=None):
+        """``comments()`` for the async view"""
+        post = await self.aget_object()
+        page = await self.apaginate_queryset(self.get_comments_queryset(post))
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return self.get_paginated_response(serializer.data)
+    
+    def get_comments_queryset(self, post):
+        return get_query_plan(CommentSerializer).apply(post.comments.filter(is_approved=True))
+    
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
     
@@ -54,33 +121,53 @@ class PostViewSet(viewsets.ModelViewSet):
         post.save()
         return Response({'message': 'Post published successfully'})
     
-    @action(detail=True, methods=['post'])
+    @action(detail=True, methods=['post', 'delete'], permission_classes=[IsAuthenticated])
     def like(self, request, slug=None):
-        """Like a post (simple implementation)"""
+        """Like (POST) or unlike (DELETE) a post; repeating either is a no-op"""
         post = self.get_object()
-        # You could implement a Like model here
-        return Response({'message': 'Post liked successfully'})
+        if request.method == 'DELETE':
+            post.remove_like(request.user)
+            message = 'Post unliked successfully'
+        else:
+            post.add_like(request.user)
+            message = 'Post liked successfully'
+        
+        post.refresh_from_db(fields=['likes_count'])
+        return Response({
+            'message': message,
+            'liked': request.method != 'DELETE',
+            'likes_count': post.likes_count
+        })
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(InstrumentedViewMixin, ConditionalRequestMixin, QueryPlanMixin, viewsets.ModelViewSet):
     """ViewSet for Comment model"""
     queryset = Comment.objects.filter(is_approved=True)
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticatedOrReadOnly, IsCommentAuthorOrReadOnly]
+    pagination_class = KeysetPagination
+    ordering = ['-created_at']
+    query_plan_actions = ['list', 'retrieve']
+    query_budgets = {'list': 5, 'retrieve': 5}
+    # Authors are shown with their post count
+    list_versions = ('comments', 'posts', 'users')
     
     def get_queryset(self):
         """Return comments for a specific post if post_id is provided"""
         post_id = self.request.query_params.get('post_id', None)
         if post_id:
-            return Comment.objects.filter(post_id=post_id, is_approved=True)
-        return Comment.objects.filter(is_approved=True)
+            queryset = Comment.objects.filter(post_id=post_id, is_approved=True)
+        else:
+            queryset = Comment.objects.filter(is_approved=True)
+        return self.plan_queryset(queryset)
     
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
-class PostSearchView(generics.ListAPIView):
+class PostSearchView(InstrumentedViewMixin, QueryPlanMixin, generics.ListAPIView):
     """Advanced search view for posts"""
     serializer_class = PostListSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
+    query_budgets = {'get': 6}
     
     def get_queryset(self):
         queryset = Post.objects.filter(status='published')
@@ -88,17 +175,15 @@ class PostSearchView(generics.ListAPIView):
         category = self.request.query_params.get('category', None)
         author = self.request.query_params.get('author', None)
         
-        if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query) |
-                Q(content__icontains=query) |
-                Q(excerpt__icontains=query)
-            )
-        
         if category:
             queryset = queryset.filter(categories__slug=category)
         
         if author:
             queryset = queryset.filter(author__username=author)
         
-        return queryset.distinct()
+        queryset = queryset.distinct()
+        if query:
+            queryset = get_search_backend().search(queryset, query)
+        
+        queryset = annotate_liked(queryset, self.request.user)
+        return self.plan_queryset(queryset)
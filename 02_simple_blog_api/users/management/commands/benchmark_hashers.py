@@ -0,0 +1,70 @@
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+from blog_api.hashers import Argon2PasswordHasher, ScryptPasswordHasher
+
+PASSWORD = 'bench-password-123'
+
+CONFIGURATIONS = [
+    ('pbkdf2 (Django default)', hashers.PBKDF2PasswordHasher),
+    ('scrypt (Django default)', hashers.ScryptPasswordHasher),
+    ('scrypt (tuned)', ScryptPasswordHasher),
+    ('argon2 (Django default)', hashers.Argon2PasswordHasher),
+    ('argon2 (tuned)', Argon2PasswordHasher),
+]
+
+
+def memory_per_hash(hasher):
+    """MiB one hash works in: scrypt's 128 * N * r bytes, argon2's memory_cost KiB"""
+    if isinstance(hasher, hashers.ScryptPasswordHasher):
+        return 128 * hasher.work_factor * hasher.block_size / 2 ** 20
+    if isinstance(hasher, hashers.Argon2PasswordHasher):
+        return hasher.memory_cost / 1024
+    return 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Report login (password verification) cost per hasher configuration: '
+        'time and memory per hash, and throughput and peak hashing memory with '
+        '--threads logins at once, as a worker with that many request threads'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+        parser.add_argument('--threads', type=int, default=os.cpu_count() or 1, help='Concurrent logins')
+
+    def handle(self, *args, **options):
+        threads = options['threads']
+        self.stdout.write(f'{threads} concurrent logins')
+        self.stdout.write(
+            f'{"hasher":<26}{"ms/login":>10}{"/s/core":>9}{"MiB/hash":>10}{"concurrent /s":>15}{"peak MiB":>10}'
+        )
+        for label, hasher_class in CONFIGURATIONS:
+            hasher = hasher_class()
+            try:
+                encoded = hasher.encode(PASSWORD, hasher.salt())
+            except ValueError as exc:
+                # Library-backed hashers (argon2) raise when it is not installed
+                self.stdout.write(f'{label:<26}skipped: {exc}')
+                continue
+            samples = []
+            for _ in range(options['logins']):
+                started = time.perf_counter()
+                hasher.verify(PASSWORD, encoded)
+                samples.append(time.perf_counter() - started)
+            serial = statistics.median(samples)
+            # hashlib's scrypt and argon2-cffi release the GIL while hashing
+            started = time.perf_counter()
+            with ThreadPoolExecutor(threads) as pool:
+                list(pool.map(lambda _: hasher.verify(PASSWORD, encoded), range(options['logins'])))
+            concurrent = options['logins'] / (time.perf_counter() - started)
+            memory = memory_per_hash(hasher)
+            self.stdout.write(
+                f'{label:<26}{serial * 1000:>10.1f}{1 / serial:>9.1f}{memory:>10.0f}{concurrent:>15.1f}'
+                f'{memory * threads:>10.0f}'
+            )
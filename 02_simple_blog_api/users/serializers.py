@@ -1,5 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from django.db.models import OuterRef
+from blog_api.query_plans import SubqueryCount
+from posts.models import Post
 from .models import User
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -39,12 +42,18 @@ class UserLoginSerializer(serializers.Serializer):
 class UserSerializer(serializers.ModelSerializer):
     """Serializer for user data"""
     posts_count = serializers.SerializerMethodField()
+    query_annotations = {
+        'annotated_posts_count': SubqueryCount(Post.objects.filter(author=OuterRef('pk'))),
+    }
     
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'bio', 'profile_picture', 'date_joined', 'posts_count']
     
     def get_posts_count(self, obj):
+        # Planned querysets annotate the count; fall back for bare instances
+        if hasattr(obj, 'annotated_posts_count'):
+            return obj.annotated_posts_count
         return obj.posts.count()
 
 class UserProfileSerializer(serializers.ModelSerializer):
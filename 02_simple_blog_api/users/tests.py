@@ -1,3 +1,80 @@
-from django.test import TestCase
+import json
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.urls import reverse
+from rest_framework.test import APIClient
+from blog_api.testing import QueryBudgetTestCase
+from posts.models import Post
+from .models import User
 
-# Create your tests here.
+
+class UserListStreamingTests(QueryBudgetTestCase):
+    """The unpaginated user list is streamed from a chunked iterator"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com') for i in range(30)
+        ])
+        author = User.objects.get(username='user0')
+        Post.objects.create(title='Hello', content='Body', author=author)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('user-list')
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_json_array(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_ACCEPT='application/json')
+            body = self.read(response)
+        self.assertEqual(response['Content-Type'], 'application/json; charset=utf-8')
+        users = json.loads(body)
+        self.assertEqual(len(users), 30)
+        self.assertEqual(users[0]['username'], 'user0')
+        self.assertEqual(users[0]['posts_count'], 1)
+
+    def test_ndjson(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/x-ndjson')
+        lines = self.read(response).splitlines()
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual([json.loads(line)['username'] for line in lines], [f'user{i}' for i in range(30)])
+
+    def test_empty_list_is_valid_json(self):
+        User.objects.all().delete()
+        self.assertEqual(json.loads(self.read(self.client.get(self.url, {'format': 'json'}))), [])
+
+    async def test_asgi_streams_from_an_async_iterator(self):
+        for accept in ('application/json', 'application/x-ndjson'):
+            response = await self.async_client.get(self.url, headers={'Accept': accept})
+            self.assertTrue(response.is_async)
+            body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+            if accept == 'application/json':
+                users = json.loads(body)
+            else:
+                users = [json.loads(line) for line in body.splitlines()]
+            self.assertEqual([user['username'] for user in users], [f'user{i}' for i in range(30)])
+            self.assertEqual(users[0]['posts_count'], 1)
+
+
+class PasswordHashingTests(QueryBudgetTestCase):
+    """New passwords use the preferred hasher; older hashes are upgraded on login"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.preferred = get_hasher().algorithm + '$'
+        self.user = User.objects.create(
+            username='alice', email='alice@example.com',
+            password=make_password('s3cret-pass', hasher='pbkdf2_sha256'),
+        )
+
+    def test_login_rehashes_legacy_passwords(self):
+        response = self.client.post(
+            reverse('user-login'), {'username': 'alice', 'password': 's3cret-pass'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(self.preferred))
+        self.assertTrue(self.user.check_password('s3cret-pass'))
@@ -2,6 +2,8 @@ from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import login, logout
+from blog_api.query_plans import QueryPlanMixin
+from blog_api.streaming import StreamingListMixin
 from .serializers import (
     UserRegistrationSerializer, 
     UserLoginSerializer, 
@@ -62,9 +64,12 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return self.request.user
 
-class UserListView(generics.ListAPIView):
-    """List all users (public information only)"""
+class UserListView(QueryPlanMixin, StreamingListMixin, generics.ListAPIView):
+    """List all users (public information only), streamed row by row"""
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
     pagination_class = None
+    
+    def get_queryset(self):
+        return self.plan_queryset(User.objects.order_by('pk'))
@@ -0,0 +1,75 @@
+from functools import partial
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from . import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that checks the token's user against claims from
+    ``authentication.user_cache`` instead of querying ``users`` every request.
+    The user row is loaded, its profile joined, only by views that read
+    more than the claims.
+    """
+
+    def get_user_queryset(self):
+        return self.user_model.objects.select_related('profile')
+
+    def load_user(self, user_id):
+        return self.get_user_queryset().get(**{api_settings.USER_ID_FIELD: user_id})
+
+    async def aload_user(self, user_id):
+        return await self.get_user_queryset().aget(**{api_settings.USER_ID_FIELD: user_id})
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_('Token contained no recognizable user identification')) from e
+
+    def check_user(self, claims, validated_token):
+        # CHECK_USER_IS_ACTIVE is a simplejwt 5.3.1 setting; 5.3.0 always checks
+        if getattr(api_settings, 'CHECK_USER_IS_ACTIVE', True) and not claims.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != claims.token_version:
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+    def make_user(self, claims, user):
+        return user_cache.CachedUser(
+            claims, partial(self.load_user, claims.pk), partial(self.aload_user, claims.pk), user,
+        )
+
+    def get_user(self, validated_token):
+        try:
+            claims, user = user_cache.get_claims(self.get_user_id(validated_token), self.load_user)
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+        self.check_user(claims, validated_token)
+        return self.make_user(claims, user)
+
+    async def aget_user(self, validated_token):
+        try:
+            claims, user = await user_cache.aget_claims(self.get_user_id(validated_token), self.aload_user)
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found') from e
+        self.check_user(claims, validated_token)
+        return self.make_user(claims, user)
+
+    async def aauthenticate(self, request):
+        """``authenticate()`` for async views; only a cache miss touches the database"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
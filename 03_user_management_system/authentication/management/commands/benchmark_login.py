@@ -0,0 +1,70 @@
+import statistics
+import time
+
+from django.contrib.auth import authenticate
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from users.models import User
+
+PASSWORD = 'bench-password-123'
+
+
+class Command(BaseCommand):
+    help = (
+        'Break login cost down into password hashing, token minting and the '
+        'last-login write, then measure end-to-end login throughput, inside a '
+        'throwaway test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=20)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(
+                username='bench', email='bench@example.com', password=PASSWORD, bio='x' * 500
+            )
+            self.run(user, options['logins'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def timed(self, label, repeat, func):
+        samples = []
+        for i in range(repeat):
+            started = time.perf_counter()
+            func(i)
+            samples.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(f'{label:<36}{statistics.median(samples):>10.2f}{statistics.mean(samples):>10.2f}')
+
+    def run(self, user, logins):
+        self.stdout.write(f'{"stage (ms per login)":<36}{"median":>10}{"mean":>10}')
+        self.timed('password hash (check_password)', logins, lambda i: user.check_password(PASSWORD))
+        self.timed('authenticate() (lookup + hash)', logins, lambda i: authenticate(username='bench', password=PASSWORD))
+
+        def mint(i):
+            refresh = RefreshToken.for_user(user)
+            return str(refresh.access_token), str(refresh)
+        self.timed('token minting', logins * 10, mint)
+
+        def full_save(i):
+            user.last_login_ip = f'10.0.0.{i % 250}'
+            user.save()
+        self.timed('write: user.save() (before)', logins * 10, full_save)
+        self.timed('write: record_login() UPDATE', logins * 10, lambda i: user.record_login(f'10.0.1.{i % 250}'))
+        self.timed('write: record_login() same IP', logins * 10, lambda i: user.record_login('10.0.1.1'))
+
+        client = APIClient()
+        url = reverse('auth-login')
+        started = time.perf_counter()
+        for _ in range(logins):
+            response = client.post(url, {'username': 'bench', 'password': PASSWORD}, format='json')
+            assert response.status_code == 200, response.data
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'end-to-end: {logins / elapsed:.1f} logins/s ({elapsed / logins * 1000:.1f} ms each)')
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from authentication.models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete revoked refresh tokens that have expired anyway, in batches so '
+        'the table is never locked for long. Run it periodically (e.g. hourly).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now()
+        expired = RevokedToken.objects.filter(expires_at__lte=cutoff).order_by('expires_at')
+        total = 0
+        while True:
+            ids = list(expired.values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            total += RevokedToken.objects.filter(pk__in=ids).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f'Pruned {total} expired revoked tokens'))
@@ -0,0 +1,18 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class RevokedToken(models.Model):
+    """A refresh token revoked before it expired (e.g. on logout)"""
+    jti = models.CharField(max_length=255, unique=True, verbose_name=_('Token ID'))
+    expires_at = models.DateTimeField(db_index=True, verbose_name=_('Expires At'))
+    revoked_at = models.DateTimeField(default=timezone.now, db_index=True, verbose_name=_('Revoked At'))
+
+    class Meta:
+        db_table = 'revoked_tokens'
+        verbose_name = _('Revoked Token')
+        verbose_name_plural = _('Revoked Tokens')
+
+    def __str__(self):
+        return self.jti
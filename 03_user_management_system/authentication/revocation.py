@@ -0,0 +1,154 @@
+"""
+Refresh-token revocation list.
+
+Revoked token ids (``jti``) are stored in the ``revoked_tokens`` table. Each
+process keeps a bloom filter of them in front of that table, so checking a
+token that was never revoked (nearly every refresh) costs a few hash
+lookups instead of a query, however many logouts have accumulated. Only
+"maybe revoked" answers are confirmed against the database.
+
+The filter is built from the table on first use and updated on every
+revocation made by this process. Revocations made by other processes are
+pulled in by an indexed ``revoked_at`` range query at most once every
+``REVOKED_TOKEN_SYNC_INTERVAL`` seconds. One thread at a time builds or
+syncs, without holding the lock checks take: they keep using the current
+filter meanwhile (or the table, before there is one), and a rebuilt filter
+is swapped in whole.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import RevokedToken
+
+# Re-read rows revoked this long before the last sync: transactions may
+# commit out of revoked_at order
+SYNC_OVERLAP = timedelta(seconds=5)
+
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity, error_rate):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.capacity = capacity
+        self.count = 0
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Kirsch-Mitzenmacher: k positions from two 64-bit hashes
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        """Add ``key``; True unless it (or a colliding key) was already in"""
+        new = False
+        for position in self._positions(key):
+            byte, bit = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & bit:
+                self.bits[byte] |= bit
+                new = True
+        # Re-added keys (e.g. the sync overlap) do not wear out the filter
+        self.count += new
+        return new
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationList:
+    """Bloom filter of revoked jtis backed by ``RevokedToken``"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_at = None  # newest revoked_at seen
+        self._checked_at = 0.0  # monotonic time of the last sync query
+        self._refreshing = False
+        self._revoked_meanwhile = []  # by this process while rebuilding
+
+    def _build(self):
+        now = timezone.now()
+        rows = RevokedToken.objects.filter(expires_at__gt=now)
+        capacity = max(settings.REVOKED_TOKEN_BLOOM_CAPACITY, rows.count() * 2)
+        bloom = BloomFilter(capacity, settings.REVOKED_TOKEN_BLOOM_ERROR_RATE)
+        for jti in rows.values_list('jti', flat=True).iterator(chunk_size=10_000):
+            bloom.add(jti)
+        return bloom, now
+
+    def _refresh(self):
+        """Build the filter, or pull in revocations made by other processes, when due"""
+        with self._lock:
+            bloom = self._bloom
+            # Over capacity the false-positive rate climbs; start afresh
+            rebuild = bloom is None or bloom.count > bloom.capacity
+            due = rebuild or time.monotonic() - self._checked_at >= settings.REVOKED_TOKEN_SYNC_INTERVAL
+            if self._refreshing or not due:
+                return
+            self._refreshing = True
+            self._revoked_meanwhile = []
+            synced_at = self._synced_at
+        try:
+            if rebuild:
+                bloom, synced_at = self._build()
+                rows = []
+            else:
+                rows = list(
+                    RevokedToken.objects.filter(revoked_at__gte=synced_at - SYNC_OVERLAP)
+                    .values_list('jti', 'revoked_at')
+                )
+            with self._lock:
+                if not rebuild:
+                    bloom = self._bloom
+                    if bloom is None:
+                        # reset() meanwhile: the next check rebuilds
+                        return
+                for jti in self._revoked_meanwhile:
+                    bloom.add(jti)
+                for jti, revoked_at in rows:
+                    bloom.add(jti)
+                    synced_at = max(synced_at, revoked_at)
+                self._bloom, self._synced_at = bloom, synced_at
+                self._checked_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._revoked_meanwhile = []
+
+    def revoke(self, jti, expires_at):
+        """Revoke ``jti`` until ``expires_at``; revoking twice is a no-op"""
+        try:
+            with transaction.atomic():
+                RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            pass
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+            if self._refreshing:
+                # A filter being built may have read the table before this
+                self._revoked_meanwhile.append(jti)
+
+    def is_revoked(self, jti):
+        self._refresh()
+        with self._lock:
+            maybe = self._bloom is None or jti in self._bloom
+        return maybe and RevokedToken.objects.filter(jti=jti).exists()
+
+    def reset(self):
+        """Forget the in-memory filter; the next check rebuilds it"""
+        with self._lock:
+            self._bloom = None
+
+
+revocations = RevocationList()
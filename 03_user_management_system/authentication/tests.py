@@ -0,0 +1,184 @@
+import pickle
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.test.client import AsyncClient, AsyncClientHandler
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from profiles.models import Profile
+from user_management.async_views import AsyncViewsHandlerMixin
+from user_management.testing import QueryBudgetTestCase
+from users.models import User
+
+from .models import RevokedToken
+from .revocation import BloomFilter, RevocationList, revocations
+from .user_cache import CachedUser, UserClaims, _shared_key, local_users
+
+
+def bearer(user):
+    return f'Bearer {AccessToken.for_user(user)}'
+
+
+class AsyncViewsClient(AsyncClient):
+    """AsyncClient that serves async views the way AsyncViewsASGIHandler does"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.handler = type('Handler', (AsyncViewsHandlerMixin, AsyncClientHandler), {})(
+            self.handler.enforce_csrf_checks
+        )
+
+
+class UserCacheTests(QueryBudgetTestCase):
+    """JWT requests are authenticated from cached claims, which changes invalidate"""
+
+    async_client_class = AsyncViewsClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user', email='user@example.com', password='pass12345')
+        cls.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pass12345', role=User.Role.ADMIN,
+        )
+        # As registration provisions it
+        Profile.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.user))
+
+    def test_cached_claims_hold_no_password(self):
+        self.client.get(reverse('user-me'))
+        claims = cache.get(_shared_key(self.user.pk))
+        self.assertIsInstance(claims, UserClaims)
+        self.assertEqual((claims.pk, claims.role, claims.is_active), (self.user.pk, User.Role.USER, True))
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(claims))
+
+    def test_warm_cache_authenticates_without_queries(self):
+        self.client.get(reverse('user-stats'))
+        # Permission checks read the claims: the users row is not loaded
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('user-stats'))
+        self.assertEqual(response.status_code, 403)
+
+    def test_claims_user_loads_the_row_on_demand(self):
+        self.client.get(reverse('user-stats'))
+        response = self.client.get(reverse('user-me'))
+        self.assertEqual(response.data['email'], 'user@example.com')
+        self.assertIsInstance(response.wsgi_request.user, CachedUser)
+        self.assertIsInstance(response.wsgi_request.user, User)
+
+    def test_role_change_takes_effect_at_once(self):
+        self.assertEqual(self.client.get(reverse('user-stats')).status_code, 403)
+        admin = APIClient()
+        admin.credentials(HTTP_AUTHORIZATION=bearer(self.admin))
+        admin.patch(reverse('user-update-role', args=[self.user.pk]), {'role': User.Role.ADMIN}, format='json')
+        self.assertEqual(self.client.get(reverse('user-stats')).status_code, 200)
+
+    def test_deactivation_takes_effect_at_once(self):
+        self.assertEqual(self.client.get(reverse('user-me')).status_code, 200)
+        admin = APIClient()
+        admin.credentials(HTTP_AUTHORIZATION=bearer(self.admin))
+        admin.post(reverse('user-activate', args=[self.user.pk]))
+        self.assertEqual(self.client.get(reverse('user-me')).status_code, 401)
+
+    @override_settings(AUTH_USER_LOCAL_CACHE_TTL=5)
+    def test_other_processes_see_changes_within_the_local_ttl(self):
+        with mock.patch('authentication.user_cache.time.monotonic', return_value=1000.0):
+            self.client.get(reverse('user-stats'))
+        # Another process deactivates the user: the shared entry is dropped,
+        # this process's local one is not
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        cache.delete(_shared_key(self.user.pk))
+        with mock.patch('authentication.user_cache.time.monotonic', return_value=1004.0):
+            self.assertEqual(self.client.get(reverse('user-stats')).status_code, 403)
+        with mock.patch('authentication.user_cache.time.monotonic', return_value=1006.0):
+            self.assertEqual(self.client.get(reverse('user-stats')).status_code, 401)
+
+    async def test_async_me_loads_the_user_through_the_async_orm(self):
+        response = await self.async_client.get(reverse('user-me'), headers={'Authorization': bearer(self.user)})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['username'], 'user')
+        response = await self.async_client.get(reverse('profile-me'), headers={'Authorization': bearer(self.user)})
+        self.assertEqual(response.status_code, 200)
+
+
+class RevocationTests(QueryBudgetTestCase):
+    """Revoked refresh tokens are refused; checking the others costs no query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user', email='user@example.com', password='pass12345')
+
+    def setUp(self):
+        revocations.reset()
+        self.addCleanup(revocations.reset)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=bearer(self.user))
+
+    def revoke_elsewhere(self, jti):
+        """A revocation made by another process"""
+        RevokedToken.objects.create(jti=jti, expires_at=timezone.now() + timedelta(days=1))
+
+    def test_logout_revokes_the_refresh_token(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        url = reverse('auth-token-refresh')
+        self.assertEqual(self.client.post(url, {'refresh': refresh}).status_code, 200)
+        self.client.post(reverse('auth-logout'), {'refresh_token': refresh})
+        self.assertEqual(self.client.post(url, {'refresh': refresh}).status_code, 401)
+
+    def test_unrevoked_tokens_are_checked_in_memory(self):
+        revocations.revoke('revoked', timezone.now() + timedelta(days=1))
+        self.assertTrue(revocations.is_revoked('revoked'))
+        with self.assertNumQueries(0):
+            self.assertFalse(revocations.is_revoked('fresh'))
+
+    @override_settings(REVOKED_TOKEN_SYNC_INTERVAL=0)
+    def test_revocations_by_other_processes_are_synced(self):
+        self.assertFalse(revocations.is_revoked('elsewhere'))
+        self.revoke_elsewhere('elsewhere')
+        self.assertTrue(revocations.is_revoked('elsewhere'))
+
+    @override_settings(REVOKED_TOKEN_SYNC_INTERVAL=0, REVOKED_TOKEN_BLOOM_CAPACITY=4)
+    def test_sync_overlap_does_not_count_towards_capacity(self):
+        revocations = RevocationList()
+        for i in range(3):
+            self.revoke_elsewhere(f'jti{i}')
+        revocations.is_revoked('first')
+        bloom = revocations._bloom
+        self.assertEqual(bloom.count, 3)
+        # Every sync re-reads the last few seconds' rows
+        for _ in range(5):
+            revocations.is_revoked('again')
+        self.assertIs(revocations._bloom, bloom)
+        self.assertEqual(bloom.count, 3)
+
+    @override_settings(REVOKED_TOKEN_BLOOM_CAPACITY=1)
+    def test_revocation_during_a_rebuild_is_kept(self):
+        revocations = RevocationList()
+        build = revocations._build
+
+        def slow_build():
+            built = build()
+            # Revoked after the rebuild read the table
+            revocations.revoke('meanwhile', timezone.now() + timedelta(days=1))
+            return built
+
+        with mock.patch.object(revocations, '_build', slow_build):
+            revocations.is_revoked('first')
+        with self.assertNumQueries(1):
+            self.assertTrue(revocations.is_revoked('meanwhile'))
+
+    def test_bloom_filter_counts_new_keys_only(self):
+        bloom = BloomFilter(100, 0.01)
+        self.assertTrue(bloom.add('a'))
+        self.assertFalse(bloom.add('a'))
+        self.assertEqual(bloom.count, 1)
+        self.assertIn('a', bloom)
+        self.assertNotIn('b', bloom)
@@ -0,0 +1,183 @@
+"""
+Two-level cache of the claims of the users behind JWT-authenticated requests.
+
+Only ``UserClaims`` are cached: the id, role and status flags permission
+checks read, and the token version ``CHECK_REVOKE_TOKEN`` compares (a
+digest of the password hash, as carried by the tokens themselves), never
+the row with its password hash. Authentication hands views a
+``CachedUser``, which answers those attributes from the claims and loads
+the ``User`` row (with its profile) the first time anything else is read.
+
+A process-local LRU (``AUTH_USER_LOCAL_CACHE_SIZE`` entries, each trusted
+for ``AUTH_USER_LOCAL_CACHE_TTL`` seconds) sits in front of Django's shared
+cache (``AUTH_USER_CACHE_TIMEOUT`` seconds), which sits in front of the
+``users`` table. Saving or deleting a user drops its shared entry and this
+process's local entry (see ``authentication.signals``); other processes
+see the change once their short local TTL has lapsed.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject, empty
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# User attributes answered from the cache without loading the row
+CLAIMS = ('pk', 'role', 'is_active', 'is_staff', 'is_superuser', 'is_admin', 'is_moderator')
+
+UserClaims = namedtuple('UserClaims', CLAIMS + ('token_version',))
+
+
+def claims_for(user):
+    return UserClaims(*(getattr(user, name) for name in CLAIMS), get_md5_hash_password(user.password))
+
+
+class CachedUser(SimpleLazyObject):
+    """
+    ``request.user`` for JWT-authenticated requests.
+
+    Claims attributes (``id`` included), ``is_authenticated`` and
+    comparisons with model instances (``obj == request.user``) cost no
+    query; any other attribute loads the user through ``load()``. Async
+    code calls ``await aget_user()`` first, as the ORM cannot be used
+    synchronously there.
+    """
+
+    def __init__(self, claims, load, aload, user=None):
+        super().__init__(load)
+        self.__dict__['claims'] = claims
+        self.__dict__['aload'] = aload
+        if user is not None:
+            self._wrapped = user
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            claims = self.__dict__['claims']
+            if name in CLAIMS:
+                return getattr(claims, name)
+            if name == 'id':
+                return claims.pk
+            if name == '_meta':
+                return get_user_model()._meta
+        return super().__getattr__(name)
+
+    @property
+    def __class__(self):
+        # isinstance() and Model.__eq__() without loading the row
+        return get_user_model()
+
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def __bool__(self):
+        return True
+
+    async def aget_user(self):
+        """The ``User`` instance, loaded through the async ORM if need be"""
+        if self._wrapped is empty:
+            self._wrapped = await self.__dict__['aload']()
+        return self._wrapped
+
+
+async def aget_full_user(user):
+    """``request.user`` as a ``User`` instance, for async views"""
+    if isinstance(user, CachedUser):
+        return await user.aget_user()
+    return user
+
+
+class LocalUserCache:
+    """Thread-safe LRU of user claims with a per-entry TTL"""
+
+    def __init__(self):
+        self._entries = OrderedDict()  # user id -> (expires at, claims)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, claims = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return claims
+
+    def set(self, user_id, claims):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + settings.AUTH_USER_LOCAL_CACHE_TTL, claims)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > settings.AUTH_USER_LOCAL_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_users = LocalUserCache()
+
+
+def _shared_key(user_id):
+    return f'auth:claims:{user_id}'
+
+
+def get_claims(user_id, load):
+    """
+    Return ``(claims, user)`` for the user with ``user_id``, calling
+    ``load(user_id)`` only when neither cache level has the claims; ``user``
+    is the instance loaded then, or None.
+    """
+    user = None
+    # Token claims may carry the id as a string
+    claims = local_users.get(str(user_id))
+    if claims is None:
+        claims = cache.get(_shared_key(user_id))
+        if claims is None:
+            user = load(user_id)
+            claims = claims_for(user)
+            cache.set(_shared_key(user_id), claims, settings.AUTH_USER_CACHE_TIMEOUT)
+        local_users.set(str(user_id), claims)
+    return claims, user
+
+
+async def aget_claims(user_id, load):
+    """``get_claims()`` for async callers; ``load`` is a coroutine function"""
+    user = None
+    claims = local_users.get(str(user_id))
+    if claims is None:
+        claims = await cache.aget(_shared_key(user_id))
+        if claims is None:
+            user = await load(user_id)
+            claims = claims_for(user)
+            await cache.aset(_shared_key(user_id), claims, settings.AUTH_USER_CACHE_TIMEOUT)
+        local_users.set(str(user_id), claims)
+    return claims, user
+
+
+def _forget(user_id):
+    local_users.discard(str(user_id))
+    cache.delete(_shared_key(user_id))
+
+
+def invalidate_user(user_id):
+    """Drop ``user_id`` from the shared cache and this process's LRU"""
+    _forget(user_id)
+    # Again once the change is visible, in case a concurrent request
+    # re-cached the old row in between
+    transaction.on_commit(lambda: _forget(user_id))
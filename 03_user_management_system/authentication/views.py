@@ -9,7 +9,10 @@ from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
 from django.conf import settings
-from .serializers import (
+from django.db import transaction
+from profiles.models import Profile
+from .tokens import RevocableRefreshToken, RevocableTokenRefreshSerializer
+from users.serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
     ChangePasswordSerializer,
@@ -19,6 +22,13 @@ from .serializers import (
 
 User = get_user_model()
 
+def get_client_ip(request):
+    """Client address: first X-Forwarded-For hop, else REMOTE_ADDR"""
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if forwarded:
+        return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR')
+
 class UserRegistrationView(generics.CreateAPIView):
     """User registration view"""
     queryset = User.objects.all()
@@ -28,7 +38,10 @@ class UserRegistrationView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+        with transaction.atomic():
+            user = serializer.save()
+            # Every account has a profile from the start
+            Profile.objects.create(user=user)
         
         # Generate tokens for the new user
         refresh = RefreshToken.for_user(user)
@@ -60,12 +73,7 @@ class UserLoginView(TokenObtainPairView):
         # Generate tokens
         refresh = RefreshToken.for_user(user)
         
-        # Update last login IP if available
-        if 'HTTP_X_FORWARDED_FOR' in request.META:
-            user.last_login_ip = request.META['HTTP_X_FORWARDED_FOR']
-        elif 'REMOTE_ADDR' in request.META:
-            user.last_login_ip = request.META['REMOTE_ADDR']
-        user.save()
+        user.record_login(get_client_ip(request))
         
         return Response({
             'message': 'Login successful',
@@ -91,7 +99,7 @@ class UserLogoutView(generics.GenericAPIView):
         try:
             refresh_token = request.data.get('refresh_token')
             if refresh_token:
-                token = RefreshToken(refresh_token)
+                token = RevocableRefreshToken(refresh_token)
                 token.blacklist()
             
             return Response({'message': 'Logout successful'})
@@ -174,5 +182,6 @@ class PasswordResetConfirmView(generics.GenericAPIView):
             )
 
 class TokenRefreshView(TokenRefreshView):
-    """Refresh JWT token view"""
+    """Refresh JWT token view (rejects revoked refresh tokens)"""
     permission_classes = [AllowAny]
+    serializer_class = RevocableTokenRefreshSerializer
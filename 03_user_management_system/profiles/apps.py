@@ -5,3 +5,6 @@ class ProfilesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'profiles'
     verbose_name = 'User Profiles'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from profiles.provisioning import backfill_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        'Create a profile for every user that has none (users created before '
+        'registration provisioned profiles, or via the admin/createsuperuser), '
+        'with one bulk INSERT per batch'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = backfill_profiles(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Created {created} missing profiles'))
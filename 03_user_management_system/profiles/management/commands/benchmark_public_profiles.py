@@ -0,0 +1,80 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from profiles.models import Profile
+from profiles.serializers import PublicProfileSerializer
+from profiles.views import PublicProfileListView
+from rest_framework import serializers
+from users.models import User
+
+
+class LegacyPublicProfileSerializer(PublicProfileSerializer):
+    """The generic field-by-field representation plus ``None`` stripping it replaced"""
+
+    def to_representation(self, instance):
+        data = serializers.ModelSerializer.to_representation(self, instance)
+        if not instance.profile_public:
+            return {'id': data['id'], 'user_username': data['user_username']}
+        return {k: v for k, v in data.items() if v is not None}
+
+
+class Command(BaseCommand):
+    help = (
+        'Time loading and serializing every public profile the old way (lazy '
+        'user per row, generic representation) and through '
+        'PublicProfileListView\'s queryset and serializer, inside a throwaway '
+        'test database'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.seed(options['profiles'])
+            self.run()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, count):
+        users = User.objects.bulk_create([
+            User(username=f'bench{i}', email=f'bench{i}@example.com', phone_number=f'555{i:07d}')
+            for i in range(count)
+        ], batch_size=1000)
+        Profile.objects.bulk_create([
+            Profile(user=user, city='Oslo', company='Example', show_email=i % 2 == 0, show_phone=i % 3 == 0)
+            for i, user in enumerate(users)
+        ], batch_size=1000)
+
+    def measure(self, queryset, serializer_class):
+        query_count = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal query_count
+            query_count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            started = time.perf_counter()
+            profiles = list(queryset)
+            loaded = time.perf_counter()
+            serializer_class(profiles, many=True).data
+            finished = time.perf_counter()
+        return query_count, (loaded - started) * 1000, (finished - loaded) * 1000
+
+    def run(self):
+        self.stdout.write(f'{"path":<10}{"queries":>9}{"load ms":>10}{"serialize ms":>14}{"total ms":>10}')
+        paths = [
+            ('before', Profile.objects.filter(profile_public=True), LegacyPublicProfileSerializer),
+            ('after', PublicProfileListView.queryset, PublicProfileSerializer),
+        ]
+        for label, queryset, serializer_class in paths:
+            query_count, load_ms, serialize_ms = self.measure(queryset.all(), serializer_class)
+            self.stdout.write(
+                f'{label:<10}{query_count:>9}{load_ms:>10.1f}{serialize_ms:>14.1f}{load_ms + serialize_ms:>10.1f}'
+            )
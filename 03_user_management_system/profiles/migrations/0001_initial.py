@@ -0,0 +1,50 @@
+# Generated by Django 4.2.7 on 2026-10-17 21:26
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Profile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gender', models.CharField(blank=True, choices=[('male', 'Male'), ('female', 'Female'), ('other', 'Other'), ('prefer_not_to_say', 'Prefer not to say')], max_length=20, verbose_name='Gender')),
+                ('address', models.TextField(blank=True, verbose_name='Address')),
+                ('city', models.CharField(blank=True, max_length=100, verbose_name='City')),
+                ('state', models.CharField(blank=True, max_length=100, verbose_name='State')),
+                ('country', models.CharField(blank=True, max_length=100, verbose_name='Country')),
+                ('postal_code', models.CharField(blank=True, max_length=20, verbose_name='Postal Code')),
+                ('company', models.CharField(blank=True, max_length=200, verbose_name='Company')),
+                ('job_title', models.CharField(blank=True, max_length=200, verbose_name='Job Title')),
+                ('website', models.URLField(blank=True, verbose_name='Website')),
+                ('linkedin', models.URLField(blank=True, verbose_name='LinkedIn')),
+                ('twitter', models.URLField(blank=True, verbose_name='Twitter')),
+                ('timezone', models.CharField(default='UTC', max_length=50, verbose_name='Timezone')),
+                ('language', models.CharField(default='en', max_length=10, verbose_name='Language')),
+                ('notification_email', models.BooleanField(default=True, verbose_name='Email Notifications')),
+                ('notification_sms', models.BooleanField(default=False, verbose_name='SMS Notifications')),
+                ('profile_public', models.BooleanField(default=True, verbose_name='Public Profile')),
+                ('show_email', models.BooleanField(default=False, verbose_name='Show Email')),
+                ('show_phone', models.BooleanField(default=False, verbose_name='Show Phone')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='profile', to=settings.AUTH_USER_MODEL, verbose_name='User')),
+            ],
+            options={
+                'verbose_name': 'Profile',
+                'verbose_name_plural': 'Profiles',
+                'db_table': 'profiles',
+                'indexes': [models.Index(condition=models.Q(('profile_public', True)), fields=['id'], name='profiles_public_idx')],
+            },
+        ),
+    ]
@@ -57,6 +57,10 @@ class Profile(models.Model):
         db_table = 'profiles'
         verbose_name = _('Profile')
         verbose_name_plural = _('Profiles')
+        indexes = [
+            # Public profile list, in id order; private profiles are left out
+            models.Index(fields=['id'], name='profiles_public_idx', condition=models.Q(profile_public=True)),
+        ]
     
     def __str__(self):
         return f"Profile of {self.user.username}"
@@ -0,0 +1,50 @@
+"""
+Profile provisioning.
+
+Registration creates the user's ``Profile`` in the same transaction as the
+user; ``backfill_profiles`` (``manage.py backfill_profiles``) covers users
+created any other way. JWT authentication loads the user with its profile
+joined (``select_related('profile')``), so ``get_profile(request.user)``
+costs no query beyond loading the user; it only creates a profile for a
+user the backfill has not reached yet.
+"""
+from django.contrib.auth import get_user_model
+from user_management.conditional import bump_list_version
+
+from .models import Profile
+
+
+def get_profile(user):
+    """``user``'s profile, created if missing"""
+    try:
+        return user.profile
+    except Profile.DoesNotExist:
+        user.profile, _ = Profile.objects.get_or_create(user=user)
+        return user.profile
+
+
+async def aget_profile(user):
+    """``get_profile()`` for async callers (never loads the profile lazily)"""
+    if type(user).profile.is_cached(user):
+        try:
+            return user.profile
+        except Profile.DoesNotExist:
+            pass
+    user.profile, _ = await Profile.objects.aget_or_create(user=user)
+    return user.profile
+
+
+def backfill_profiles(batch_size=1000):
+    """Create the missing profiles, ``batch_size`` per INSERT; return how many"""
+    missing = get_user_model().objects.filter(profile__isnull=True).order_by('pk').values_list('pk', flat=True)
+    created = 0
+    while True:
+        user_ids = list(missing[:batch_size])
+        if not user_ids:
+            if created:
+                # bulk_create() sends no post_save
+                bump_list_version('profiles')
+            return created
+        # A profile created concurrently (e.g. by get_profile) is skipped
+        Profile.objects.bulk_create([Profile(user_id=pk) for pk in user_ids], ignore_conflicts=True)
+        created += len(user_ids)
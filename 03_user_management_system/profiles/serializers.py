@@ -53,6 +53,17 @@ class PublicProfileSerializer(serializers.ModelSerializer):
     user_email = serializers.SerializerMethodField()
     user_phone = serializers.SerializerMethodField()
     
+    # Profile columns shown as stored (non-null text) on a public profile
+    text_fields = (
+        'gender', 'city', 'state', 'country', 'company',
+        'job_title', 'website', 'linkedin', 'twitter'
+    )
+    # Everything to_representation() reads, for .only() on list querysets
+    query_fields = (
+        'id', 'profile_public', 'show_email', 'show_phone', 'created_at',
+        'user__username', 'user__email', 'user__phone_number'
+    ) + text_fields
+    
     class Meta:
         model = Profile
         fields = [
@@ -76,12 +87,25 @@ class PublicProfileSerializer(serializers.ModelSerializer):
         return None
     
     def to_representation(self, instance):
-        """Filter out private information"""
-        data = super().to_representation(instance)
+        """
+        Filter out private information.
+        
+        Builds the dict directly instead of running every declared field and
+        then dropping the ``None`` values: only the email and phone can be
+        ``None``, so they are simply left out unless shown.
+        """
+        user = instance.user
+        data = {'id': instance.id, 'user_username': user.username}
         
         # Remove fields that are not public
         if not instance.profile_public:
-            return {'id': data['id'], 'user_username': data['user_username']}
+            return data
         
-        # Remove None values
-        return {k: v for k, v in data.items() if v is not None}
+        if instance.show_email:
+            data['user_email'] = user.email
+        if instance.show_phone:
+            data['user_phone'] = user.phone_number
+        for name in self.text_fields:
+            data[name] = getattr(instance, name)
+        data['created_at'] = self.fields['created_at'].to_representation(instance.created_at)
+        return data
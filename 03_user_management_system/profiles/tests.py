@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from user_management.testing import QueryBudgetTestCase
+from users.models import User
+from .models import Profile
+
+
+class PublicProfileListTests(QueryBudgetTestCase):
+    """The public profile list is one joined query per page, however many rows it shows"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader = User.objects.create_user(username='reader', email='reader@example.com', password='pass12345')
+        users = User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com', phone_number=f'555{i:07d}')
+            for i in range(8)
+        ])
+        Profile.objects.bulk_create([
+            Profile(
+                user=user, city='Oslo', profile_public=i != 1, show_email=i % 2 == 0, show_phone=i % 3 == 0
+            )
+            for i, user in enumerate(users)
+        ])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # The page, with its owners joined, and the paginator's COUNT
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('profile-public-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 7)
+
+        Profile.objects.bulk_create([
+            Profile(user=User.objects.create_user(username=f'extra{i}', email=f'extra{i}@example.com'))
+            for i in range(3)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('profile-public-list'))
+        self.assertEqual(len(queries), 2)
+        self.assertEqual(len(response.data['results']), 10)
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn('JOIN "users"', page_query)
+        # only(): private columns are never read
+        self.assertNotIn('"address"', page_query)
+        self.assertNotIn('"password"', page_query)
+
+    def test_private_details_are_left_out(self):
+        rows = {row['user_username']: row for row in self.client.get(reverse('profile-public-list')).data['results']}
+        self.assertNotIn('user1', rows)
+        self.assertEqual(rows['user0']['user_email'], 'user0@example.com')
+        self.assertEqual(rows['user0']['user_phone'], '5550000000')
+        self.assertNotIn('user_email', rows['user3'])
+        self.assertNotIn('user_phone', rows['user2'])
+        self.assertEqual(rows['user2']['city'], 'Oslo')
+
+
+class ProfileListETagTests(QueryBudgetTestCase):
+    """Profile list ETags come from list versions bumped on every profile or user write"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pass12345', role=User.Role.ADMIN,
+        )
+        cls.profile = Profile.objects.create(user=User.objects.create_user(username='user', email='u@example.com'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_list_is_not_modified_until_a_profile_goes(self):
+        etag = self.client.get(reverse('profile-list'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('profile-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.profile.delete()
+        response = self.client.get(reverse('profile-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        self.admin.first_name = 'Renamed'
+        self.admin.save()
+        self.assertEqual(self.client.get(reverse('profile-list'), HTTP_IF_NONE_MATCH=etag).status_code, 200)
@@ -2,7 +2,13 @@ from rest_framework import viewsets, generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from django.db.models import F
+from authentication.user_cache import aget_full_user
+from user_management.async_views import AsyncViewSetMixin
+from user_management.conditional import ConditionalRequestMixin
+from user_management.instrumentation import InstrumentedViewMixin
 from .models import Profile
+from .provisioning import aget_profile, get_profile
 from .serializers import (
     ProfileSerializer,
     ProfileUpdateSerializer,
@@ -12,11 +18,19 @@ from .serializers import (
 )
 from users.permissions import IsOwnerOrReadOnly, IsOwnerOrAdmin
 
-class ProfileViewSet(viewsets.ModelViewSet):
+class ProfileViewSet(InstrumentedViewMixin, ConditionalRequestMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for Profile model"""
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+    # Profiles also show the owner's username and email
+    validator_fields = ('updated_at', 'user_updated_at')
+    list_versions = ('profiles', 'users')
+    conditional_actions = ConditionalRequestMixin.conditional_actions + ('public', 'me')
+    async_actions = ('me',)
+    # Most queries per request, including the one JWT authentication runs on
+    # a user cache miss
+    query_budgets = {'list': 4, 'retrieve': 3, 'me': 1, 'public': 3}
     
     def get_serializer_class(self):
         if self.action in ['update', 'partial_update']:
@@ -34,13 +48,36 @@ class ProfileViewSet(viewsets.ModelViewSet):
         user = self.request.user
         
         if user.is_admin:
-            return Profile.objects.all()
+            queryset = Profile.objects.all()
         elif user.is_moderator:
             # Moderators can see all profiles but not sensitive info
-            return Profile.objects.all()
+            queryset = Profile.objects.all()
         else:
             # Regular users can only see public profiles
-            return Profile.objects.filter(profile_public=True)
+            queryset = Profile.objects.filter(profile_public=True)
+        
+        if self.action in ('list', 'retrieve', 'public'):
+            # The profile serializers read the owner's username and email
+            queryset = queryset.select_related('user')
+        return queryset
+    
+    def get_validator_queryset(self):
+        return self.get_queryset().annotate(user_updated_at=F('user__updated_at'))
+    
+    def get_validator_object(self):
+        if self.action == 'me':
+            return get_profile(self.request.user)
+        return super().get_validator_object()
+    
+    async def aget_validator_object(self):
+        # me is the only async action
+        return await aget_profile(await aget_full_user(self.request.user))
+    
+    def get_object_validators(self, obj):
+        if self.action == 'me':
+            # Loaded with request.user: no annotation needed
+            return {'updated_at': obj.updated_at, 'user_updated_at': self.request.user.updated_at}
+        return super().get_object_validators(obj)
     
     @action(detail=True, methods=['patch'])
     def update_privacy(self, request, pk=None):
@@ -78,15 +115,13 @@ class ProfileViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Get current user's profile"""
-        try:
-            profile = request.user.profile
-            serializer = ProfileSerializer(profile)
-            return Response(serializer.data)
-        except Profile.DoesNotExist:
-            return Response(
-                {'error': 'Profile not found'}, 
-                status=status.HTTP_404_NOT_FOUND
-            )
+        serializer = ProfileSerializer(get_profile(request.user))
+        return Response(serializer.data)
+    
+    async def ame(self, request):
+        """``me()`` for the async view"""
+        serializer = ProfileSerializer(await aget_profile(await aget_full_user(request.user)))
+        return Response(serializer.data)
 
 class ProfileDetailView(generics.RetrieveUpdateAPIView):
     """Profile detail view and update"""
@@ -94,13 +129,18 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     
     def get_object(self):
-        return self.request.user.profile
+        return get_profile(self.request.user)
 
-class PublicProfileListView(generics.ListAPIView):
+class PublicProfileListView(InstrumentedViewMixin, generics.ListAPIView):
     """List all public profiles"""
-    queryset = Profile.objects.filter(profile_public=True)
+    # One joined query per page, reading only the columns the serializer shows
+    queryset = Profile.objects.filter(profile_public=True).select_related('user').only(
+        *PublicProfileSerializer.query_fields
+    ).order_by('pk')
     serializer_class = PublicProfileSerializer
     permission_classes = [IsAuthenticated]
+    # The page and its COUNT, plus authentication's user cache miss
+    query_budgets = {'get': 3}
 
 class ProfilePrivacyView(generics.UpdateAPIView):
     """Update profile privacy settings"""
@@ -108,7 +148,7 @@ class ProfilePrivacyView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     
     def get_object(self):
-        return self.request.user.profile
+        return get_profile(self.request.user)
 
 class ProfilePreferencesView(generics.UpdateAPIView):
     """Update profile preferences"""
@@ -116,4 +156,4 @@ class ProfilePreferencesView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     
     def get_object(self):
-        return self.request.user.profile
+        return get_profile(self.request.user)
@@ -9,8 +9,12 @@ https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'user_management.settings')
+django.setup(set_prefix=False)
 
-application = get_asgi_application()
+from user_management.async_views import AsyncViewsASGIHandler  # noqa: E402 (needs the app registry)
+
+# get_asgi_application(), but serving the async views of routes that have one
+application = AsyncViewsASGIHandler()
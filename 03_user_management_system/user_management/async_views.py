@@ -0,0 +1,108 @@
+"""
+Async variants of DRF viewset actions, served when the project runs on ASGI.
+
+Under ASGI a sync DRF view holds a thread for its whole duration (Django
+runs it through ``sync_to_async``), while under WSGI an async view costs an
+``async_to_sync`` round trip per request and is slower than the sync one.
+So routes keep their sync view, and ``AsyncViewSetMixin`` gives the ones
+serving an action listed in ``async_actions`` a second, async view
+(``view.async_view``) whose dispatch calls the action's async variant
+``a<action>()``. ``AsyncViewsASGIHandler``, the ``application`` of
+``asgi.py``, serves that view; the WSGI application never sees it.
+
+The async dispatch
+
+* authenticates with the authenticators' ``aauthenticate()`` where they
+  have one and in a worker thread otherwise (session authentication
+  among them: it has no async API before Django 5.0);
+* awaits ``ainitial()`` hooks, e.g. the conditional-request validators;
+* leaves the database work of the handler to the async ORM (``aget``,
+  ``aget_full_user()``).
+
+Other methods on those routes run the sync dispatch in a worker thread.
+"""
+from asgiref.sync import markcoroutinefunction, sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from rest_framework import exceptions
+
+
+class AsyncViewsHandlerMixin:
+    """Serves a route's ``async_view`` where it has one"""
+
+    def resolve_request(self, request):
+        match = super().resolve_request(request)
+        match.func = getattr(match.func, 'async_view', match.func)
+        return match
+
+
+class AsyncViewsASGIHandler(AsyncViewsHandlerMixin, ASGIHandler):
+    """``ASGIHandler`` serving the async views"""
+
+
+class AsyncViewSetMixin:
+    """
+    Lets viewset actions have an async variant, ``a<action>()``.
+
+    List the actions that have one in ``async_actions``. Put the mixin after mixins that add ``ainitial()`` hooks
+    (such as ``ConditionalRequestMixin``) and before the DRF viewset class.
+    """
+    async_actions = ()
+    # Set on the instances behind a route's async view
+    serve_async = False
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if set(actions.values()) & set(cls.async_actions):
+            view.async_view = markcoroutinefunction(super().as_view(actions, serve_async=True, **initkwargs))
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.serve_async:
+            return self.adispatch(request, *args, **kwargs)
+        return super().dispatch(request, *args, **kwargs)
+
+    async def adispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        if action not in self.async_actions:
+            return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+        handler = getattr(self, f'a{action}')
+
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs):
+        """``initial()`` with authentication awaited"""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        request.accepted_renderer, request.accepted_media_type = self.perform_content_negotiation(request)
+        request.version, request.versioning_scheme = self.determine_version(request, *args, **kwargs)
+        await self.aperform_authentication(request)
+        self.check_permissions(request)
+        self.check_throttles(request)
+
+    async def aperform_authentication(self, request):
+        """Resolve ``request.user`` / ``request.auth`` the way ``Request._authenticate()`` does"""
+        for authenticator in request.authenticators:
+            authenticate = getattr(authenticator, 'aauthenticate', None) or sync_to_async(authenticator.authenticate)
+            try:
+                user_auth_tuple = await authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
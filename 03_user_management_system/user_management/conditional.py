@@ -0,0 +1,171 @@
+"""
+Conditional requests for DRF viewsets.
+
+``ConditionalRequestMixin`` reads a few validator values before the handler
+runs. For detail actions they are the object's own ``updated_at`` and
+anything else that changes its representation, read with one query. They
+become a strong ETag and a Last-Modified header. Lists are validated by list
+versions instead: counters in the cache that every write to the rows a list
+shows bumps (``bump_list_version()``). They cost a cache read rather than
+an aggregate over the whole table, and unlike ``MAX(updated_at)`` they also
+change on deletes. Lists get an ETag but no Last-Modified. So
+
+* ``If-None-Match`` / ``If-Modified-Since`` on GET are answered with
+  ``304 Not Modified`` before anything is fetched in full or serialized;
+* ``If-Match`` / ``If-Unmodified-Since`` on PUT/PATCH/DELETE reject writes
+  based on a stale copy with ``412 Precondition Failed``.
+
+Views with async handlers (see ``async_views``) read the validators in
+``ainitial()``, from the object their ``aget_validator_object()`` loads
+through the async ORM.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import permissions
+
+
+def _version_key(name):
+    return f'list-version:{name}'
+
+
+def get_list_version(name):
+    # Seeded from the clock so an evicted version never restarts at a value
+    # an earlier ETag was made from
+    return cache.get_or_set(_version_key(name), time.time_ns, None)
+
+
+def _bump(name):
+    try:
+        cache.incr(_version_key(name))
+    except ValueError:
+        cache.set(_version_key(name), time.time_ns(), None)
+
+
+def bump_list_version(name):
+    """Change list version ``name``, and so the ETags of the lists depending on it"""
+    _bump(name)
+    # Again once the change is visible, in case a concurrent request paired
+    # the old rows with the new version in between
+    transaction.on_commit(lambda: _bump(name))
+
+
+class PreconditionResponse(Exception):
+    """Short-circuits the handler with a 304/412 response"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalRequestMixin:
+    """
+    ETag / Last-Modified validators and conditional handling for viewsets.
+
+    ``validator_fields`` lists the model fields (or annotations added by
+    ``get_validator_queryset()``) whose values identify a version of one
+    object; the first is its modification time. ``list_versions`` names the
+    list versions a change to any row of the list bumps; without them lists
+    are not conditional.
+    """
+    validator_fields = ('updated_at',)
+    list_versions = ()
+    conditional_actions = ('list', 'retrieve', 'update', 'partial_update', 'destroy')
+    precondition_headers = ('HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+
+    def get_validator_queryset(self):
+        """Queryset validators are read from; override to drop eager loading"""
+        return self.get_queryset()
+
+    def get_validator_object(self):
+        """The object for detail actions, fetched without eager loading"""
+        queryset = self.filter_queryset(self.get_validator_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def get_object_validators(self, obj):
+        return {field: getattr(obj, field) for field in self.validator_fields}
+
+    def get_list_versions(self):
+        return self.list_versions
+
+    def get_validators(self):
+        if self.action == 'list':
+            return {
+                'query': self.request.GET.urlencode(),
+                'versions': [get_list_version(name) for name in self.get_list_versions()],
+            }
+        return self.get_object_validators(self.get_validator_object())
+
+    async def aget_validators(self):
+        # The async actions (me) serve one object, which the views load
+        # themselves
+        return self.get_object_validators(await self.aget_validator_object())
+
+    def make_etag(self, validators):
+        # Representations differ per user (e.g. by role) and per renderer
+        state = repr((
+            self.request.user.pk, getattr(self.request.accepted_renderer, 'format', None),
+            sorted(validators.items()),
+        ))
+        return quote_etag(hashlib.sha1(state.encode()).hexdigest())
+
+    def needs_validators(self, request):
+        if self.action not in self.conditional_actions:
+            return False
+        if self.action == 'list' and not self.get_list_versions():
+            return False
+        # Unconditional writes skip the lookup
+        return request.method in permissions.SAFE_METHODS or any(
+            header in request.META for header in self.precondition_headers
+        )
+
+    def check_preconditions(self, request):
+        """Answer with 304/412 (via PreconditionResponse) when the validators say so"""
+        modified = self.validators.get(self.validator_fields[0])
+        response = get_conditional_response(
+            request,
+            etag=self.make_etag(self.validators),
+            last_modified=int(modified.timestamp()) if modified else None,
+        )
+        if response is not None:
+            raise PreconditionResponse(response)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if self.needs_validators(request):
+            self.validators = self.get_validators()
+            self.check_preconditions(request)
+
+    async def ainitial(self, request, *args, **kwargs):
+        await super().ainitial(request, *args, **kwargs)
+        self.validators = None
+        if self.needs_validators(request):
+            self.validators = await self.aget_validators()
+            self.check_preconditions(request)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, PreconditionResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators is None or response.status_code not in (200, 304):
+            return response
+        if request.method not in permissions.SAFE_METHODS:
+            # Hand back the new version for the client's next If-Match
+            validators = self.get_validators()
+        response['ETag'] = self.make_etag(validators)
+        modified = validators.get(self.validator_fields[0])
+        if modified:
+            response['Last-Modified'] = http_date(modified.timestamp())
+        return response
@@ -0,0 +1,54 @@
+"""
+Query plans of the querysets behind API endpoints.
+
+``endpoint_queryset()`` builds the queryset a view would read for a GET
+request, the way the view builds it: ``get_queryset()``, the filter
+backends, then either the detail lookup or the first page of the
+paginator. Nothing is executed, so ``explain()`` on the result shows the
+plan the endpoint gets. ``full_scans()`` picks the tables such a plan reads
+in full, which is what a missing or unusable index looks like.
+"""
+import re
+
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .pagination import KeysetPagination
+
+# Plan lines that read a whole table (the table name is the first group)
+FULL_SCAN_PATTERNS = {
+    'sqlite': re.compile(r'\bSCAN (\w+)$'),
+    'postgresql': re.compile(r'Seq Scan on (\w+)'),
+}
+
+
+def endpoint_queryset(view_class, action=None, user=None, params=None, **kwargs):
+    """The queryset ``view_class`` (``action`` for viewsets) reads for a GET with ``params``"""
+    request = APIRequestFactory().get('/', params or {})
+    if user is not None:
+        force_authenticate(request, user)
+    view = view_class()
+    if action is not None:
+        view.action_map = {'get': action}
+    view.args, view.kwargs, view.format_kwarg = (), kwargs, None
+    view.request = view.initialize_request(request, **kwargs)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    lookup_url_kwarg = getattr(view, 'lookup_url_kwarg', None) or getattr(view, 'lookup_field', None)
+    if lookup_url_kwarg in kwargs:
+        return queryset.filter(**{view.lookup_field: kwargs[lookup_url_kwarg]})
+    paginator = view.paginator
+    if isinstance(paginator, KeysetPagination):
+        page = paginator.get_page_queryset(queryset, view.request, view)
+        return page[:paginator.page_size + 1]
+    return queryset[:paginator.get_page_size(view.request)]
+
+
+def full_scans(plan):
+    """Tables ``plan`` (``QuerySet.explain()`` output) reads without an index"""
+    pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+    if pattern is None:
+        return []
+    tables = set(connection.introspection.table_names())
+    scanned = (pattern.search(line) for line in plan.splitlines())
+    return list(dict.fromkeys(match.group(1) for match in scanned if match and match.group(1) in tables))
@@ -0,0 +1,285 @@
+"""
+Per-request query and timing instrumentation.
+
+``QueryMetricsMiddleware`` counts the SQL queries of each request and the
+time spent in the database (through an execute wrapper on every
+connection, so queries run by async views in worker threads count too)
+and splits the rest of the request into
+
+* ``serialize``: time in the action handler outside the database, which
+  for read actions is serializing (set by ``InstrumentedViewMixin``);
+* ``render``: time in the renderer (JSON encoding);
+* ``total``: the whole request as seen by the middleware.
+
+They are sent back as a ``Server-Timing`` header and aggregated per view
+action into an in-process histogram, served by ``MetricsView`` to admins.
+
+Views declare ``query_budgets = {'list': 4, ...}``. A request going over its
+action's budget is logged, and raises ``QueryBudgetExceeded`` when
+``QUERY_BUDGET_RAISE`` is set (as ``testing.QueryBudgetTestCase`` does),
+which fails the test that made it.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from users.permissions import IsAdminUser
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view action ran more queries than its ``query_budgets`` entry allows"""
+
+
+class RequestMetrics:
+    """Query count and timings (seconds) of one request"""
+
+    def __init__(self):
+        self.name = None
+        self.budget = None
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.render = 0.0
+        self.total = 0.0
+        self._handler_started = None
+
+    def start_handler(self):
+        self._handler_started = (time.perf_counter(), self.db)
+
+    def end_handler(self):
+        if self._handler_started is None:
+            return
+        started, db = self._handler_started
+        self.serialize += time.perf_counter() - started - (self.db - db)
+        self._handler_started = None
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f'serialize;dur={self.serialize * 1000:.1f}',
+            f'render;dur={self.render * 1000:.1f}',
+            f'total;dur={self.total * 1000:.1f}',
+        ])
+
+
+def record_query(execute, sql, params, many, context):
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db += time.perf_counter() - started
+
+
+def install_query_recorder(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created)
+def install_on_connect(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+class Histogram:
+    """Request count and bucketed latencies of one view action"""
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.over_budget = 0
+        self.timings = {name: [0] * (len(BUCKETS_MS) + 1) for name in ('db', 'serialize', 'render', 'total')}
+        self.sums = dict.fromkeys(self.timings, 0.0)
+
+    def add(self, metrics, over_budget):
+        self.requests += 1
+        self.queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.over_budget += over_budget
+        for name, counts in self.timings.items():
+            ms = getattr(metrics, name) * 1000
+            counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+            self.sums[name] += ms
+
+    def percentile(self, counts, p):
+        """Upper bound (ms) of the bucket holding the ``p``th percentile; None if open-ended"""
+        rank = p / 100 * self.requests
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def as_dict(self):
+        labels = [f'<={bound}ms' for bound in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}ms']
+        return {
+            'requests': self.requests,
+            'queries': {'mean': self.queries / self.requests, 'max': self.max_queries},
+            'over_budget': self.over_budget,
+            **{
+                name: {
+                    'mean_ms': self.sums[name] / self.requests,
+                    'p50_ms': self.percentile(counts, 50),
+                    'p95_ms': self.percentile(counts, 95),
+                    'p99_ms': self.percentile(counts, 99),
+                    'buckets': {label: count for label, count in zip(labels, counts) if count},
+                }
+                for name, counts in self.timings.items()
+            },
+        }
+
+
+class MetricsRegistry:
+    """Per-process histograms keyed by view action"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def add(self, metrics, over_budget=False):
+        with self.lock:
+            histogram = self.histograms.get(metrics.name)
+            if histogram is None:
+                histogram = self.histograms[metrics.name] = Histogram()
+            histogram.add(metrics, over_budget)
+
+    def snapshot(self):
+        with self.lock:
+            return {name: histogram.as_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+class QueryMetricsMiddleware:
+    """Measures each request; see the module docstring"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics, token = self.start()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.total = time.perf_counter() - started
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def start(self):
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        metrics = RequestMetrics()
+        return metrics, _current.set(metrics)
+
+    def finish(self, request, response, metrics):
+        if metrics.name is None:
+            match = request.resolver_match
+            metrics.name = match.view_name if match else 'unresolved'
+        over_budget = metrics.budget is not None and metrics.queries > metrics.budget
+        registry.add(metrics, over_budget)
+        response['Server-Timing'] = metrics.server_timing()
+        if over_budget:
+            message = f'{metrics.name} ran {metrics.queries} queries (budget {metrics.budget})'
+            logger.warning(message)
+            if settings.QUERY_BUDGET_RAISE:
+                raise QueryBudgetExceeded(message)
+        return response
+
+
+class InstrumentedViewMixin:
+    """
+    Names the request after the view action, times its handler and renderer.
+
+    ``query_budgets`` maps actions (HTTP methods on non-viewset views) to the
+    most queries a request to them may run, authentication included.
+    """
+    query_budgets = {}
+
+    def get_metrics_action(self):
+        """The viewset action, or the HTTP method for other views"""
+        return getattr(self, 'action', None) or self.request.method.lower()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.start_metrics()
+
+    async def ainitial(self, request, *args, **kwargs):
+        await super().ainitial(request, *args, **kwargs)
+        self.start_metrics()
+
+    def start_metrics(self):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.start_handler()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        metrics = _current.get()
+        if metrics is None:
+            return response
+        metrics.end_handler()
+        action = self.get_metrics_action()
+        metrics.name = f'{type(self).__name__}.{action}'
+        metrics.budget = self.query_budgets.get(action)
+        if hasattr(response, 'render'):
+            # Render now rather than in the handler, so the time can be told apart
+            started = time.perf_counter()
+            response.render()
+            metrics.render += time.perf_counter() - started
+        return response
+
+
+class MetricsView(APIView):
+    """Per-action query counts and latency histograms of this process (the admin role only)"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=204)
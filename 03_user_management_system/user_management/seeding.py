@@ -0,0 +1,159 @@
+"""
+Bulk loading of deterministic synthetic data for ``manage.py seed``.
+
+``bulk_load()`` opens the run's transaction and hands the command an
+``insert()`` function. Rows are plain tuples built a batch at a time by
+module-level generator functions, called with a ``random.Random``, the
+batch's ``start`` and ``stop`` indexes and the generator's own arguments::
+
+    def user_rows(rng, start, stop, first_id, password):
+        return [(first_id + i, f'user{first_id + i}', password) for i in range(start, stop)]
+
+Each batch's random stream is seeded with the run's seed, the generator
+and the batch start, so a seed and batch size always give the same rows
+however many ``--workers`` generate them. Workers only build tuples; this
+process writes each batch with a single ``executemany`` (``TableWriter``),
+skipping model instances and ``bulk_create()``'s per-object work and
+999-parameter statements on SQLite. Primary keys are assigned up front
+(``next_id()``) so generators can point foreign keys at rows created
+earlier in the run.
+
+Columns a generator leaves out get the field default, and auto_now(_add)
+timestamps the time of the run. Sequences are reset afterwards on backends
+that have them.
+"""
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from functools import partial
+
+import django
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+# Field types of the seeded columns whose Python values the database driver
+# takes as they are
+PASSTHROUGH_TYPES = {'BigAutoField', 'BooleanField', 'CharField', 'OneToOneField'}
+
+# SQLite page cache while seeding (KiB); at the 2MB default, index pages
+# spill to disk on every batch once a table outgrows it, doubling load time
+SQLITE_CACHE_KIB = 512 * 1024
+
+
+def _generate(function, seed, args, bounds):
+    start, stop = bounds
+    rng = random.Random(f'{seed}:{function.__name__}:{start}')
+    return function(rng, start, stop, *args)
+
+
+def generate(function, total, args=(), seed=0, batch_size=10000, workers=1):
+    """Yield ``function``'s rows for ``range(total)``, a batch at a time, in order"""
+    bounds = [(start, min(start + batch_size, total)) for start in range(0, total, batch_size)]
+    task = partial(_generate, function, seed, args)
+    if workers <= 1 or len(bounds) <= 1:
+        yield from map(task, bounds)
+        return
+    # Under the spawn start method workers import the project from scratch
+    with multiprocessing.Pool(workers, initializer=django.setup) as pool:
+        yield from pool.imap(task, bounds)
+
+
+def next_id(model, using=DEFAULT_DB_ALIAS):
+    """The primary key following the highest one in ``model``'s table"""
+    return (model._default_manager.using(using).aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+class TableWriter:
+    """INSERTs rows (tuples of values for the ``fields`` names) into ``model``'s table"""
+
+    def __init__(self, model, fields, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+        opts = model._meta
+        given = [opts.get_field(name) for name in fields]
+        names = {field.name for field in given}
+        now = timezone.now()
+        defaults = [field for field in opts.concrete_fields if field.name not in names and not field.primary_key]
+        self.extra = tuple(
+            field.get_db_prep_save(
+                now if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+                else field.get_default(),
+                self.connection,
+            )
+            for field in defaults
+        )
+        # Generated timestamps and dates repeat a lot: each value is prepared once
+        self.adapters = [
+            (i, field, {}) for i, field in enumerate(given) if field.get_internal_type() not in PASSTHROUGH_TYPES
+        ]
+        qn = self.connection.ops.quote_name
+        columns = [field.column for field in given + defaults]
+        self.sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+            qn(opts.db_table), ', '.join(map(qn, columns)), ', '.join(['%s'] * len(columns)),
+        )
+
+    def prepare(self, row):
+        row = list(row)
+        for i, field, prepared in self.adapters:
+            value = row[i]
+            try:
+                row[i] = prepared[value]
+            except KeyError:
+                row[i] = prepared[value] = field.get_db_prep_save(value, self.connection)
+        return tuple(row) + self.extra
+
+    def write(self, rows):
+        if self.adapters:
+            rows = [self.prepare(row) for row in rows]
+        elif self.extra:
+            rows = [row + self.extra for row in rows]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(self.sql, rows)
+
+
+def add_arguments(parser):
+    """The options of a seed command besides its row counts"""
+    parser.add_argument('--seed', type=int, default=0, help='Same seed and batch size, same rows')
+    parser.add_argument('--batch-size', type=int, default=10000, help='Rows generated and inserted at a time')
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Processes generating rows; inserts stay in this one, so it pays off for costly rows only',
+    )
+    parser.add_argument('--password', default='password', help='Password of every seeded user')
+
+
+@contextmanager
+def bulk_load(command, options):
+    """
+    Yield ``insert(model, fields, function, total, *args)``, which writes
+    ``total`` units of ``function``'s rows of ``fields`` into ``model``'s
+    table; everything is inserted in one transaction, after which the
+    written tables' sequences are reset.
+    """
+    models = []
+
+    def insert(model, fields, function, total, *args):
+        started = time.perf_counter()
+        writer = TableWriter(model, fields)
+        rows = 0
+        for batch in generate(function, total, args, options['seed'], options['batch_size'], options['workers']):
+            writer.write(batch)
+            rows += len(batch)
+        if model not in models:
+            models.append(model)
+        command.stdout.write(f'{model._meta.db_table}: {rows} rows in {time.perf_counter() - started:.1f}s')
+
+    started = time.perf_counter()
+    with transaction.atomic():
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute(f'PRAGMA cache_size = -{SQLITE_CACHE_KIB}')
+        yield insert
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        if statements:
+            with connection.cursor() as cursor:
+                for sql in statements:
+                    cursor.execute(sql)
+    command.stdout.write(command.style.SUCCESS(f'Seeded in {time.perf_counter() - started:.1f}s'))
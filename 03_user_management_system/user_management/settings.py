@@ -1,4 +1,5 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from datetime import timedelta
 
@@ -28,6 +29,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'user_management.instrumentation.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +84,20 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: PASSWORD_HASHER picks the algorithm new passwords use,
+# argon2 where argon2-cffi is installed and scrypt otherwise. The rest stay
+# listed so existing hashes still verify; they are re-encoded with the
+# preferred hasher on the next login
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'scrypt')
+_PASSWORD_HASHERS = {
+    'argon2': 'user_management.hashers.Argon2PasswordHasher',
+    'scrypt': 'user_management.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -97,7 +113,7 @@ AUTH_USER_MODEL = 'users.User'
 # DRF Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.backends.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -141,6 +157,31 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Seconds a /api/users/stats/ snapshot is served from cache (also invalidated on User changes)
+USER_STATS_CACHE_TIMEOUT = 30
+
+# JWT requests check their user's claims (id, role, status) from a
+# per-process LRU (trusted for AUTH_USER_LOCAL_CACHE_TTL seconds) backed by
+# the shared cache
+AUTH_USER_CACHE_TIMEOUT = 300
+AUTH_USER_LOCAL_CACHE_TTL = 5
+AUTH_USER_LOCAL_CACHE_SIZE = 1024
+
+# Logins from the same IP within this many seconds of the last recorded one
+# skip the last_login write
+LAST_LOGIN_UPDATE_INTERVAL = 60
+
+# Revoked refresh tokens: per-process bloom filter sizing, and how often
+# (seconds) each process picks up revocations made elsewhere
+REVOKED_TOKEN_BLOOM_CAPACITY = 1_000_000
+REVOKED_TOKEN_BLOOM_ERROR_RATE = 0.001
+REVOKED_TOKEN_SYNC_INTERVAL = 1
+
+# Raise instead of only logging when a view action runs more queries than its
+# query_budgets entry allows (QUERY_BUDGET_RAISE=1); tests turn it on through
+# user_management.testing.QueryBudgetTestCase, whatever runs them
+QUERY_BUDGET_RAISE = os.environ.get('QUERY_BUDGET_RAISE') == '1'
+
 # Email Configuration (for password reset)
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 EMAIL_HOST = 'localhost'
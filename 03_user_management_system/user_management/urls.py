@@ -3,8 +3,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
+from user_management.instrumentation import MetricsView
 from users.views import UserViewSet
-from profiles.views import ProfileViewSet
+from profiles.views import ProfileViewSet, PublicProfileListView
 
 # Create routers for ViewSets
 user_router = DefaultRouter()
@@ -16,6 +17,9 @@ profile_router.register(r'profiles', ProfileViewSet, basename='profile')
 urlpatterns = [
     path('admin/', admin.site.urls),
     
+    # Listed before the router, whose profiles/<pk>/ route would catch it
+    path('api/profiles/public/', PublicProfileListView.as_view(), name='profile-public-list'),
+    
     # API endpoints
     path('api/', include(user_router.urls)),
     path('api/', include(profile_router.urls)),
@@ -27,8 +31,8 @@ urlpatterns = [
     path('api/users/me/', UserViewSet.as_view({'get': 'me'}), name='user-me'),
     path('api/users/stats/', UserViewSet.as_view({'get': 'stats'}), name='user-stats'),
     
-    # Profile-specific endpoints
-    path('api/profiles/public/', ProfileViewSet.as_view({'get': 'public'}), name='profile-public'),
+    # Per-action query counts and latencies (admins only)
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
 ]
 
 # Serve media files in development
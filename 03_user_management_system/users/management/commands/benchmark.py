@@ -0,0 +1,50 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from user_management import benchmark
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed users and their profiles into a throwaway test database, then '
+        'report throughput and p50/p95/p99 latency of the user and profile '
+        'endpoints through the test client and over HTTP against a local server'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Number of users to seed')
+        benchmark.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        previous = benchmark.load(options['compare']) if options['compare'] else None
+        with benchmark.test_database():
+            started = time.perf_counter()
+            user = self.seed(options['users'])
+            seed_seconds = time.perf_counter() - started
+            self.stdout.write(f'Seeded {options["users"]} users in {seed_seconds:.1f}s')
+            results = benchmark.run(self.get_endpoints(user), benchmark.token_headers(user), options)
+        benchmark.report(
+            self, results, previous, options, scale={'users': options['users']}, seed_seconds=seed_seconds,
+        )
+
+    def seed(self, users):
+        # manage.py seed's bulk loader: users of every role, each with a profile
+        call_command('seed', users=max(users, 1), stdout=StringIO())
+        # Requests are made as an active regular user
+        regular = User.objects.filter(is_active=True, role=User.Role.USER).order_by('pk')
+        return regular.first() or User.objects.order_by('pk').first()
+
+    def get_endpoints(self, user):
+        return [
+            ('user list', reverse('user-list')),
+            ('user list by role', f'{reverse("user-list")}?role=moderator'),
+            ('user detail', reverse('user-detail', args=[user.pk])),
+            ('users/me', reverse('user-me')),
+            ('profile list', reverse('profile-list')),
+            ('profiles/me', reverse('profile-me')),
+            ('public profiles', reverse('profile-public-list')),
+        ]
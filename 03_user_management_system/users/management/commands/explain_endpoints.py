@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from profiles.views import ProfileViewSet, PublicProfileListView
+from user_management.explain import endpoint_queryset, full_scans
+from users.models import User
+from users.views import UserViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        'Print the query plan of each endpoint\'s queryset and flag tables it '
+        'reads in full, against a throwaway test database'
+    )
+
+    # (label, table) pairs that read a whole table by design
+    expected_scans = set()
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true', help='Fail if any endpoint scans a whole table')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create_user(username='explain', email='explain@example.com', password='explain')
+            admin = User.objects.create_user(
+                username='explain-admin', email='explain-admin@example.com', password='explain', role=User.Role.ADMIN
+            )
+            scanning = self.explain(self.get_endpoints(user, admin))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        if scanning and options['strict']:
+            raise CommandError(f'Full table scans in: {", ".join(scanning)}')
+
+    def get_endpoints(self, user, admin):
+        """(label, queryset) for each endpoint and filter combination worth watching"""
+        return [
+            ('GET /api/users/ (user)', endpoint_queryset(UserViewSet, 'list', user)),
+            ('GET /api/users/ (admin)', endpoint_queryset(UserViewSet, 'list', admin)),
+            ('GET /api/users/?role=...', endpoint_queryset(UserViewSet, 'list', admin, {'role': 'moderator'})),
+            ('GET /api/users/?is_verified=false', endpoint_queryset(
+                UserViewSet, 'list', admin, {'is_verified': 'false'}
+            )),
+            ('GET /api/users/{id}/', endpoint_queryset(UserViewSet, 'retrieve', user, pk=1)),
+            ('GET /api/profiles/ (user)', endpoint_queryset(ProfileViewSet, 'list', user)),
+            ('GET /api/profiles/public/', endpoint_queryset(PublicProfileListView, user=user)),
+            ('GET /api/profiles/{id}/public/', endpoint_queryset(ProfileViewSet, 'public', user, pk=1)),
+        ]
+
+    def explain(self, endpoints):
+        """Print each plan; return the labels of endpoints that scan a whole table"""
+        scanning = []
+        for label, queryset in endpoints:
+            plan = queryset.explain()
+            tables = [table for table in full_scans(plan) if (label, table) not in self.expected_scans]
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(plan)
+            if tables:
+                scanning.append(label)
+                self.stdout.write(self.style.WARNING(f'full scan: {", ".join(tables)}'))
+            self.stdout.write('')
+        return scanning
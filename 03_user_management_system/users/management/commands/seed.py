@@ -0,0 +1,92 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from profiles.models import Profile
+from user_management import seeding
+from user_management.seeding import bulk_load, next_id
+from users.models import User
+
+FIRST_NAMES = ('Ada', 'Alan', 'Grace', 'Linus', 'Margaret', 'Ken', 'Barbara', 'Dennis', 'Frances', 'Guido')
+LAST_NAMES = ('Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Hamilton', 'Thompson', 'Liskov', 'Ritchie', 'Allen')
+CITIES = ('Oslo', 'Lagos', 'Lima', 'Pune', 'Austin', 'Berlin', 'Osaka', 'Porto', 'Quito', 'Perth')
+COMPANIES = ('Initech', 'Globex', 'Hooli', 'Umbrella', 'Stark', 'Wayne', 'Acme', 'Cyberdyne')
+JOB_TITLES = ('Engineer', 'Designer', 'Manager', 'Analyst', 'Writer', 'Researcher')
+# Roughly one moderator and one admin in twenty users
+ROLES = [User.Role.USER] * 18 + [User.Role.MODERATOR, User.Role.ADMIN]
+
+
+def user_rows(rng, start, stop, first_id, password, now):
+    rows = []
+    for i in range(start, stop):
+        pk = first_id + i
+        created = now - timedelta(hours=rng.randrange(24 * 365 * 2))
+        rows.append((
+            pk,
+            f'user{pk}',
+            f'user{pk}@example.com',
+            password,
+            rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES),
+            rng.choice(ROLES),
+            f'555{pk % 10 ** 7:07d}',
+            date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 55)) if rng.random() < 0.6 else None,
+            rng.random() < 0.7,
+            rng.random() < 0.95,
+            created,
+            created,
+            created,
+        ))
+    return rows
+
+
+def profile_rows(rng, start, stop, first_user, now):
+    rows = []
+    for i in range(start, stop):
+        created = now - timedelta(hours=rng.randrange(24 * 365))
+        rows.append((
+            first_user + i,
+            rng.choice(Profile.Gender.values),
+            rng.choice(CITIES),
+            rng.choice(COMPANIES),
+            rng.choice(JOB_TITLES),
+            rng.random() < 0.8,
+            rng.random() < 0.3,
+            rng.random() < 0.1,
+            created,
+            created,
+        ))
+    return rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill the database with synthetic users, all sharing one password, and '
+        'a profile for each in batched multi-row inserts; deterministic per --seed'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100000, help='Number of users to create')
+        seeding.add_arguments(parser)
+
+    def handle(self, *args, **options):
+        users = options['users']
+        with bulk_load(self, options) as insert:
+            # Hashed once: every seeded user signs in with --password
+            password = make_password(options['password'])
+            now = timezone.now().replace(minute=0, second=0, microsecond=0)
+            first_user = next_id(User)
+            insert(
+                User,
+                ['id', 'username', 'email', 'password', 'first_name', 'last_name', 'role', 'phone_number',
+                 'date_of_birth', 'is_verified', 'is_active', 'date_joined', 'created_at', 'updated_at'],
+                user_rows, users, first_user, password, now,
+            )
+            # Every user has a profile, as registration provisions one
+            insert(
+                Profile,
+                ['user', 'gender', 'city', 'company', 'job_title', 'profile_public', 'show_email', 'show_phone',
+                 'created_at', 'updated_at'],
+                profile_rows, users, first_user, now,
+            )
@@ -1,5 +1,9 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 class User(AbstractUser):
@@ -56,6 +60,22 @@ class User(AbstractUser):
         verbose_name = _('User')
         verbose_name_plural = _('Users')
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of the user list
+            models.Index(fields=['-created_at', '-id'], name='users_created_idx'),
+            # ... of the list regular users get, which only shows active users
+            models.Index(
+                fields=['-created_at', '-id'], name='users_active_created_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # ?role= on the list
+            models.Index(fields=['role', '-created_at', '-id'], name='users_role_created_idx'),
+            # ?is_verified=false, the few accounts still awaiting verification
+            models.Index(
+                fields=['-created_at', '-id'], name='users_unverified_created_idx',
+                condition=models.Q(is_verified=False),
+            ),
+        ]
     
     def __str__(self):
         return self.username
@@ -80,3 +100,22 @@ class User(AbstractUser):
     def get_role_display_name(self):
         """Get human-readable role name"""
         return dict(self.Role.choices)[self.role]
+    
+    def record_login(self, ip_address=None):
+        """
+        Store ``last_login`` and ``last_login_ip`` with one targeted UPDATE.
+
+        Skipped (returns False) when the IP is unchanged and the previous
+        login was recorded less than ``LAST_LOGIN_UPDATE_INTERVAL`` seconds
+        ago, so bursts of logins do not each cost a write.
+        """
+        now = timezone.now()
+        recent = self.last_login and now - self.last_login < timedelta(seconds=settings.LAST_LOGIN_UPDATE_INTERVAL)
+        if recent and ip_address == self.last_login_ip:
+            return False
+        
+        self.last_login = now
+        self.last_login_ip = ip_address
+        # update() skips save(): no full-row rewrite, no post_save receivers
+        type(self).objects.filter(pk=self.pk).update(last_login=now, last_login_ip=ip_address)
+        return True
@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from user_management.conditional import bump_list_version
+from .models import User
+from .stats import invalidate_user_stats
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_stats_on_user_change(sender, **kwargs):
+    invalidate_user_stats()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_users_version(sender, **kwargs):
+    """User and profile lists show user fields (see ``list_versions``)"""
+    bump_list_version('users')
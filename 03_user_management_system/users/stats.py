@@ -0,0 +1,82 @@
+"""
+User statistics for the admin dashboard.
+
+All counters come from one conditional-aggregation query and the signup
+histogram from one grouped query, however many roles exist. Results are
+cached for ``USER_STATS_CACHE_TIMEOUT`` seconds under a generation number
+that ``users.signals`` bumps on every User save/delete, so invalidation is
+a single cache write.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDay, TruncWeek
+from django.utils import timezone
+
+from .models import User
+
+SIGNUP_BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+}
+GENERATION_KEY = 'users:stats:generation'
+
+
+def invalidate_user_stats():
+    """Make every cached snapshot stale"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, 1, None)
+
+
+def get_user_stats(period='day', days=30):
+    """Return the (possibly cached) statistics snapshot"""
+    generation = cache.get_or_set(GENERATION_KEY, 1, None)
+    key = f'users:stats:{generation}:{period}:{days}'
+    stats = cache.get(key)
+    if stats is None:
+        stats = compute_user_stats(period, days)
+        cache.set(key, stats, getattr(settings, 'USER_STATS_CACHE_TIMEOUT', 30))
+    return stats
+
+
+def compute_user_stats(period='day', days=30):
+    """Totals, per-role counts and signups per ``period`` over the last ``days`` days"""
+    counts = User.objects.aggregate(
+        total_users=Count('id'),
+        active_users=Count('id', filter=Q(is_active=True)),
+        verified_users=Count('id', filter=Q(is_verified=True)),
+        **{
+            f'role_{role}': Count('id', filter=Q(role=role))
+            for role in User.Role.values
+        },
+    )
+    users_by_role = {role: counts.pop(f'role_{role}') for role in User.Role.values}
+
+    signups = (
+        User.objects
+        .filter(created_at__gte=timezone.now() - timedelta(days=days))
+        .annotate(period=SIGNUP_BUCKETS[period]('created_at'))
+        .values('period')
+        .annotate(count=Count('id'))
+        .order_by('period')
+    )
+
+    return {
+        **counts,
+        'admin_users': users_by_role[User.Role.ADMIN],
+        'moderator_users': users_by_role[User.Role.MODERATOR],
+        'regular_users': users_by_role[User.Role.USER],
+        'users_by_role': users_by_role,
+        'signups': {
+            'period': period,
+            'days': days,
+            'buckets': [
+                {'start': row['period'].date().isoformat(), 'count': row['count']}
+                for row in signups
+            ],
+        },
+    }
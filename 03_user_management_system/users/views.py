@@ -3,6 +3,11 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from django_filters.rest_framework import DjangoFilterBackend
+from authentication.user_cache import aget_full_user
+from user_management.async_views import AsyncViewSetMixin
+from user_management.conditional import ConditionalRequestMixin
+from user_management.instrumentation import InstrumentedViewMixin
+from user_management.pagination import KeysetPagination
 from .models import User
 from .serializers import (
     UserProfileSerializer,
@@ -10,6 +15,7 @@ from .serializers import (
     UserRoleUpdateSerializer,
     UserListSerializer
 )
+from .stats import SIGNUP_BUCKETS, get_user_stats
 from .permissions import (
     IsOwnerOrReadOnly,
     IsAdminUser,
@@ -17,15 +23,23 @@ from .permissions import (
     IsOwnerOrAdmin
 )
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(InstrumentedViewMixin, ConditionalRequestMixin, AsyncViewSetMixin, viewsets.ModelViewSet):
     """ViewSet for User model"""
     queryset = User.objects.all()
     serializer_class = UserProfileSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+    pagination_class = KeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['role', 'is_active', 'is_verified']
     search_fields = ['username', 'first_name', 'last_name', 'email']
     ordering_fields = ['username', 'first_name', 'last_name', 'created_at', 'last_login']
+    ordering = ['-created_at']
+    conditional_actions = ConditionalRequestMixin.conditional_actions + ('me',)
+    list_versions = ('users',)
+    async_actions = ('me',)
+    # Most queries per request, including the one JWT authentication runs on
+    # a user cache miss
+    query_budgets = {'list': 3, 'retrieve': 3, 'me': 1, 'stats': 3}
     
     def get_serializer_class(self):
         if self.action in ['update', 'partial_update']:
@@ -36,6 +50,16 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserListSerializer
         return UserProfileSerializer
     
+    def get_validator_object(self):
+        if self.action == 'me':
+            # Loading request.user is the one query; me() reuses it
+            return self.request.user
+        return super().get_validator_object()
+    
+    async def aget_validator_object(self):
+        # me is the only async action
+        return await aget_full_user(self.request.user)
+    
     def get_queryset(self):
         """Return users based on user's role"""
         user = self.request.user
@@ -53,7 +77,9 @@ class UserViewSet(viewsets.ModelViewSet):
     def update_role(self, request, pk=None):
         """Update user role (admin only)"""
         user = self.get_object()
-        serializer = UserRoleUpdateSerializer(user, data=request.data, partial=True)
+        serializer = UserRoleUpdateSerializer(
+            user, data=request.data, partial=True, context=self.get_serializer_context()
+        )
         serializer.is_valid(raise_exception=True)
         serializer.save()
         
@@ -105,30 +131,36 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserProfileSerializer(request.user)
         return Response(serializer.data)
     
+    async def ame(self, request):
+        """``me()`` for the async view"""
+        return Response(UserProfileSerializer(await aget_full_user(request.user)).data)
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
-        """Get user statistics (admin only)"""
+        """Get user statistics and signups per day/week (admin only)"""
         if not request.user.is_admin:
             return Response(
                 {'error': 'Only admins can view statistics'}, 
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        total_users = User.objects.count()
-        active_users = User.objects.filter(is_active=True).count()
-        verified_users = User.objects.filter(is_verified=True).count()
-        admin_users = User.objects.filter(role='admin').count()
-        moderator_users = User.objects.filter(role='moderator').count()
-        regular_users = User.objects.filter(role='user').count()
+        period = request.query_params.get('period', 'day')
+        if period not in SIGNUP_BUCKETS:
+            return Response(
+                {'error': f"period must be one of: {', '.join(SIGNUP_BUCKETS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= 366:
+            return Response(
+                {'error': 'days must be an integer between 1 and 366'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        return Response({
-            'total_users': total_users,
-            'active_users': active_users,
-            'verified_users': verified_users,
-            'admin_users': admin_users,
-            'moderator_users': moderator_users,
-            'regular_users': regular_users
-        })
+        return Response(get_user_stats(period, days))
 
 class UserProfileView(generics.RetrieveUpdateAPIView):
     """User profile view and update"""